@@ -1,17 +1,26 @@
+import json
 import os
-from dataclasses import asdict
-from math import floor
+from bisect import bisect_right
+from itertools import accumulate
 
-from flask import Flask, jsonify, request, send_file, send_from_directory
+from flask import Flask, Response, jsonify, request, send_file, send_from_directory
 from flask_cors import CORS
 
-from lib.bonds import Bond, BrickWidth
-from lib.wall_state import Stride, WallState, find_best_stride
+from lib.bonds import BOND_NAMES, Bond, BrickWidth
+from lib.geometry import StrideEnvelope
+from lib.openings import Opening
+from lib.progressive import ProgressiveWall, iter_bond_rows
+from lib.segments import plan_in_segments
+from lib.snapshot import load_snapshot, save_snapshot
+from lib.travel import BuildCostModel, plan_travel_aware
+from lib.wall_state import Stride, WallState, find_best_stride, stride_score
 
-FULL_BRICK_WIDTH = 220
-COURSE_HEIGHT = 65.5
-STRIDE_WIDTH = floor((800 / FULL_BRICK_WIDTH) * BrickWidth.FULL)
-STRIDE_HEIGHT = floor(1300 / COURSE_HEIGHT)
+MODES = ("left-to-right", "optimal-strides", "parallel-strides", "travel-strides")
+# Modes that plan all strides of the wall upfront
+PLANNED_MODES = ("parallel-strides", "travel-strides")
+
+# Optional per-wall dimensions in millimeters accepted by /api/init
+ENVELOPE_PARAMS = ("stride_width", "stride_height", "full_brick_width", "course_height")
 
 
 class App:
@@ -20,14 +29,32 @@ class App:
         CORS(self.app)
         self.wall = WallState()
         self.brick_generator = None
-        self.current_stride = Stride(0, 0, STRIDE_WIDTH, STRIDE_HEIGHT)
+        self.envelope = StrideEnvelope()
+        self.current_stride = Stride(0, 0, self.envelope.width, self.envelope.height)
+        self.mode = None
+        self.cost_model = BuildCostModel()
+        # Strides of the planned modes and the history step each of them ends at
+        self.plan: list[Stride] | None = None
+        self.plan_ends: list[int] = []
+        self.plan_cursor = 0
+        self.progressive = None
+        self.snapshot_path = os.environ.get("WALL_SNAPSHOT_PATH", "wall.snapshot")
+        self.checkpoint_every = 0
+        self.placements_since_checkpoint = 0
 
         # Register routes
         self.app.route("/", defaults={"path": ""})(self.serve)
         self.app.route("/<path:path>")(self.serve)
         self.app.route("/api/init", methods=["POST"])(self.init_wall)
+        self.app.route("/api/init/<wall_id>/rows")(self.init_rows)
         self.app.route("/api/next")(self.next_block)
         self.app.route("/api/reset", methods=["POST"])(self.reset)
+        self.app.route("/api/snapshot", methods=["POST"])(self.snapshot)
+        self.app.route("/api/restore", methods=["POST"])(self.restore)
+        self.app.route("/api/undo", methods=["POST"])(self.undo)
+        self.app.route("/api/redo", methods=["POST"])(self.redo)
+        self.app.route("/api/seek", methods=["POST"])(self.seek)
+        self.app.route("/api/stats")(self.stats)
 
     def serve(self, path):
         if path and os.path.exists(os.path.join(self.app.static_folder, path)):
@@ -40,63 +67,347 @@ class App:
         height = data.get("height")
         bond = data.get("bond")
         mode = data.get("mode")
+        lazy = data.get("lazy", False)
+        progressive = bool(data.get("progressive", False))
+        # Also plan the greedy strides in the planned modes, to compare the plans
+        compare = bool(data.get("compare", False))
+        checkpoint_every = data.get("checkpoint_every", 0)
+
+        if not isinstance(checkpoint_every, int) or checkpoint_every < 0:
+            return (
+                jsonify({"error": "checkpoint_every must be a non-negative integer"}),
+                400,
+            )
+        self.checkpoint_every = checkpoint_every
+        self.placements_since_checkpoint = 0
 
         try:
-            if bond == "flemish":
-                self.wall.initialize_wall(width * BrickWidth.HALF, height, Bond.FLEMISH)
-            elif bond == "english":
-                self.wall.initialize_wall(width * BrickWidth.HALF, height, Bond.ENGLISH)
-            elif bond == "wildverband":
-                self.wall.initialize_wall(width * BrickWidth.HALF, height, Bond.WILD)
-            else:
-                self.wall.initialize_wall(
-                    width * BrickWidth.HALF, height, Bond.STRETCHER
+            self.envelope = StrideEnvelope(
+                **{name: data[name] for name in ENVELOPE_PARAMS if name in data}
+            )
+        except TypeError:
+            return (
+                jsonify({"error": "Stride and brick dimensions must be numbers"}),
+                400,
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        self.current_stride = Stride(0, 0, self.envelope.width, self.envelope.height)
+
+        try:
+            cost_model = BuildCostModel(**data.get("cost_model", {}))
+        except TypeError:
+            return (
+                jsonify(
+                    {
+                        "error": "Cost model accepts numbers for move_seconds, "
+                        "lift_seconds, brick_seconds and stride_seconds"
+                    }
+                ),
+                400,
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Openings are given in half bricks and rows, like the wall size
+        try:
+            openings = [
+                Opening(
+                    x=int(opening["x"]) * BrickWidth.HALF,
+                    y=int(opening["y"]),
+                    width=int(opening["width"]) * BrickWidth.HALF,
+                    height=int(opening["height"]),
+                    lintel=bool(opening.get("lintel", True)),
                 )
+                for opening in data.get("openings", [])
+            ]
+        except (KeyError, TypeError, ValueError):
+            return (
+                jsonify({"error": "Openings need integer x, y, width and height"}),
+                400,
+            )
+
+        if progressive and mode not in ("left-to-right", "optimal-strides"):
+            return (
+                jsonify({"error": "Progressive walls can not be planned upfront"}),
+                400,
+            )
+
+        self._stop_generation()
+        bond = BOND_NAMES.get(bond, Bond.STRETCHER)
+        try:
+            self.wall.initialize_wall(
+                width * BrickWidth.HALF,
+                height,
+                bond,
+                lazy=bool(lazy),
+                openings=openings,
+                progressive=progressive,
+            )
         except ValueError as e:
             return jsonify({"error": str(e)}), 400
 
+        if progressive:
+            # Rows are generated in the background and streamed from /rows
+            self.progressive = ProgressiveWall(
+                height,
+                iter_bond_rows(
+                    width * BrickWidth.HALF, height, bond, self.wall.openings
+                ),
+            ).start()
+
         # Choose brick placement strategy based on mode
+        self.plan = None
+        plan_summary = None
         if mode == "left-to-right":
             self.brick_generator = self.wall.place_bricks_left_to_right()
         elif mode == "optimal-strides":
             self.brick_generator = self.wall.place_bricks_for_stride(
                 stride=self.current_stride
             )
+        elif mode in PLANNED_MODES:
+            self.cost_model = cost_model
+            try:
+                plan_summary = self._plan(mode, compare)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            self.brick_generator = iter(())
         else:
             return jsonify({"error": "Invalid mode specified"}), 400
+        self.mode = mode
 
-        return jsonify(self.wall.to_dict())
+        response = self.wall.to_dict()
+        if plan_summary is not None:
+            response["plan"] = plan_summary
+        if self.progressive is not None:
+            response["wall_id"] = self.progressive.wall_id
+            response["rows_url"] = f"/api/init/{self.progressive.wall_id}/rows"
+            return jsonify(response), 202
+        return jsonify(response)
+
+    def init_rows(self, wall_id):
+        """Stream the rows of a progressively generated wall as JSON lines."""
+        progressive = self.progressive
+        if progressive is None or progressive.wall_id != wall_id:
+            return jsonify({"error": "Unknown wall"}), 404
+        return Response(
+            (json.dumps(event) + "\n" for event in progressive.events()),
+            mimetype="application/x-ndjson",
+        )
 
     def next_block(self):
         if self.brick_generator is None:
             return jsonify({"error": "Wall not initialized"}), 400
 
+        if self.progressive is not None:
+            self.progressive.sync(self.wall)
+
+        position = self.wall.history.position
         brick = next(self.brick_generator, None)
 
-        if brick is None:
-            self.current_stride = find_best_stride(
-                self.wall, STRIDE_WIDTH, STRIDE_HEIGHT
-            )
+        if brick is None and self.mode == "left-to-right" and self.progressive:
+            # Continue with the rows finished since the generator was created
+            self.brick_generator = self.wall.place_bricks_left_to_right()
+            brick = next(self.brick_generator, None)
+
+        if brick is None and self.wall.height:
+            if self.plan is not None:
+                if self.plan_cursor < len(self.plan):
+                    self.current_stride = self.plan[self.plan_cursor]
+                    self.plan_cursor += 1
+            else:
+                self.current_stride = find_best_stride(
+                    self.wall, self.envelope.width, self.envelope.height
+                )
             print(
                 f"Next optimal stride {self.current_stride.origin_x}, {self.current_stride.origin_y}"
             )
-            self.brick_generator = self.wall.place_bricks_for_stride(
-                self.current_stride
-            )
-            brick = next(self.brick_generator, None)
+            # Wait for more rows instead of counting strides that place nothing
+            if self.progressive is None or stride_score(self.wall, self.current_stride):
+                self.brick_generator = self.wall.place_bricks_for_stride(
+                    self.current_stride
+                )
+                brick = next(self.brick_generator, None)
+
+        if brick is not None and self.checkpoint_every:
+            self.placements_since_checkpoint += 1
+            # Defer checkpoints until all rows of a progressive wall are added
+            if (
+                self.placements_since_checkpoint >= self.checkpoint_every
+                and self.wall.height >= self.wall.expected_height
+            ):
+                save_snapshot(self.wall, self.snapshot_path, self.envelope)
+                self.placements_since_checkpoint = 0
 
         print(self.current_stride)
         response = {
             "wall": self.wall.to_dict(),
             "stride": self.current_stride,
+            "history": self._history_dict(),
+            "changed": self._changed_bricks(position),
         }
+        if self.progressive is not None:
+            response["generation"] = self.progressive.summary()
 
         return jsonify(response)
 
     def reset(self):
         self.wall.reset()
         self.brick_generator = None
-        return jsonify(asdict(self.wall))
+        self.plan = None
+        return jsonify(self.wall.to_dict())
+
+    def snapshot(self):
+        if not self.wall.bricks:
+            return jsonify({"error": "Wall not initialized"}), 400
+        if self.progressive is not None and not self.progressive.done:
+            return jsonify({"error": "Wall is still being generated"}), 400
+
+        save_snapshot(self.wall, self.snapshot_path, self.envelope)
+        self.placements_since_checkpoint = 0
+        return jsonify({"path": self.snapshot_path})
+
+    def restore(self):
+        data = request.get_json(silent=True) or {}
+        mode = data.get("mode", self.mode or "optimal-strides")
+
+        try:
+            (wall, envelope) = load_snapshot(self.snapshot_path)
+        except FileNotFoundError:
+            return jsonify({"error": "No snapshot found"}), 404
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if mode not in MODES:
+            return jsonify({"error": "Invalid mode specified"}), 400
+        if mode in PLANNED_MODES:
+            # The planners need all rows in memory
+            wall.bricks = list(wall.bricks)
+        self._stop_generation()
+        self.wall = wall
+        self.envelope = envelope
+        self.mode = mode
+        self.placements_since_checkpoint = 0
+        self.plan = None
+        if mode in PLANNED_MODES:
+            # The plan is not part of the snapshot, plan the rest of the wall again
+            try:
+                self._plan(mode)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+        self._resume_placement()
+
+        return jsonify(self.wall.to_dict())
+
+    def undo(self):
+        if self.brick_generator is None:
+            return jsonify({"error": "Wall not initialized"}), 400
+
+        position = self.wall.history.position
+        self.wall.undo()
+        return self._time_travel_response(position)
+
+    def redo(self):
+        if self.brick_generator is None:
+            return jsonify({"error": "Wall not initialized"}), 400
+
+        position = self.wall.history.position
+        self.wall.redo()
+        return self._time_travel_response(position)
+
+    def seek(self):
+        if self.brick_generator is None:
+            return jsonify({"error": "Wall not initialized"}), 400
+
+        step = (request.get_json(silent=True) or {}).get("step")
+        if not isinstance(step, int):
+            return jsonify({"error": "step must be an integer"}), 400
+        position = self.wall.history.position
+        try:
+            self.wall.seek(step)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return self._time_travel_response(position)
+
+    def stats(self):
+        return jsonify({"stride_cache": self.wall.stride_scores.stats()})
+
+    def _time_travel_response(self, position: int):
+        self._resume_placement()
+        response = {
+            "wall": self.wall.to_dict(),
+            "stride": None,
+            "history": self._history_dict(),
+            "changed": self._changed_bricks(position),
+        }
+        return jsonify(response)
+
+    def _plan(self, mode: str, compare: bool = False) -> dict:
+        """Plan the strides of the rest of the wall in a planned mode and return a
+        summary of the plan."""
+        if mode == "parallel-strides":
+            plan = plan_in_segments(
+                self.wall,
+                self.envelope.width,
+                self.envelope.height,
+                compare=compare,
+            )
+            summary = {
+                "strides": len(plan.strides),
+                "segment_strides": plan.segment_strides,
+                "seam_strides": plan.seam_strides,
+                "greedy_strides": plan.greedy_strides,
+                "seconds": plan.seconds,
+            }
+        else:
+            plan = plan_travel_aware(
+                self.wall,
+                self.envelope.width,
+                self.envelope.height,
+                self.cost_model,
+                compare=compare,
+            )
+            summary = {
+                "strides": len(plan.strides),
+                "estimated_seconds": plan.seconds,
+                "heuristic_seconds": plan.heuristic_seconds,
+                "greedy_strides": plan.greedy_strides,
+                "greedy_seconds": plan.greedy_seconds,
+                "seconds": plan.planning_seconds,
+            }
+
+        self.plan = plan.strides
+        self.plan_ends = list(
+            accumulate(plan.bricks_per_stride, initial=self.wall.history.position)
+        )[1:]
+        self.plan_cursor = 0
+        return summary
+
+    def _resume_placement(self):
+        """Continue placing from the current wall state. Planned modes continue with
+        the planned stride the current history step belongs to."""
+        if self.mode == "left-to-right":
+            self.brick_generator = self.wall.place_bricks_left_to_right()
+        else:
+            self.brick_generator = iter(())
+        if self.plan is not None:
+            self.plan_cursor = bisect_right(self.plan_ends, self.wall.history.position)
+
+    def _stop_generation(self):
+        if self.progressive is not None:
+            self.progressive.cancel()
+            self.progressive = None
+
+    def _history_dict(self) -> dict:
+        return {
+            "step": self.wall.history.position,
+            "total": len(self.wall.history.entries),
+        }
+
+    def _changed_bricks(self, position: int) -> list[list[int]]:
+        """Bricks placed or reverted since a history position, as [row, col]."""
+        (first, last) = sorted((position, self.wall.history.position))
+        return [[e.row, e.col] for e in self.wall.history.entries[first:last]]
 
     def run(self, host="0.0.0.0", port=8000, debug=True):
         self.app.run(host=host, port=port, debug=debug)
@@ -1,6 +1,19 @@
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import './styles.css';
-import { Stride, WallState } from './types';
+import WallCanvas from './WallCanvas';
+import {
+  Brick,
+  ChangedBricks,
+  GenerationSummary,
+  PlacementHistory,
+  RowEvent,
+  StepResponse,
+  Stride,
+  WallState,
+} from './types';
+
+// Modes that find strides while placing, the others plan the whole wall upfront
+const PROGRESSIVE_MODES = ['left-to-right', 'optimal-strides'];
 
 function App() {
   const [wallConfig, setWallConfig] = useState({
@@ -10,9 +23,54 @@ function App() {
     bond: 'stretcher'
   });
   const [wallState, setWallState] = useState<WallState | null>(null);
+  // Bricks changed by the last step, the canvas only repaints them
+  const [changedBricks, setChangedBricks] = useState<ChangedBricks | null>(null);
   const [strideState, setStrideState] = useState<Stride | null>(null);
+  const [history, setHistory] = useState<PlacementHistory>({ step: 0, total: 0 });
   const [showDialog, setShowDialog] = useState(true);
   const [isLoading, setIsLoading] = useState(false);
+  const [initError, setInitError] = useState<string | null>(null);
+  const [generation, setGeneration] = useState<GenerationSummary | null>(null);
+  // A new wall gets a new canvas, which fits the view to it
+  const [wallKey, setWallKey] = useState(0);
+  const streamedRows = useRef<Brick[][]>([]);
+
+  // Add streamed rows the last server response did not have yet
+  const mergeStreamedRows = (wall: WallState | null): WallState | null => {
+    const rows = streamedRows.current;
+    if (!wall || wall.bricks.length >= rows.length) return wall;
+    return { ...wall, bricks: [...wall.bricks, ...rows.slice(wall.bricks.length)] };
+  };
+
+  const streamRows = async (url: string) => {
+    const res = await fetch(`http://localhost:8000${url}`);
+    const reader = res.body!.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value;
+      const lines = buffer.split('\n');
+      buffer = lines.pop()!;
+      for (const line of lines) {
+        const event: RowEvent | GenerationSummary = JSON.parse(line);
+        if ('row' in event) {
+          streamedRows.current[event.row] = event.bricks;
+          setWallState(mergeStreamedRows);
+        } else {
+          setGeneration(event);
+        }
+      }
+    }
+  };
+
+  const showStep = (data: StepResponse) => {
+    const wall = mergeStreamedRows(data.wall);
+    setWallState(wall);
+    setChangedBricks(wall && { wall, bricks: data.changed });
+    setStrideState(data.stride);
+    setHistory(data.history);
+  };
 
   const handleNextBrick = async () => {
     if (!wallState || isLoading) return;
@@ -20,9 +78,9 @@ function App() {
     setIsLoading(true);
     try {
       const res = await fetch('http://localhost:8000/api/next');
-      const data = await res.json();
-      setWallState(data.wall);
-      setStrideState(data.stride);
+      const data: StepResponse = await res.json();
+      showStep(data);
+      if (data.generation) setGeneration(data.generation);
     } catch (err) {
       console.error('Error fetching next brick:', err);
     } finally {
@@ -30,6 +88,26 @@ function App() {
     }
   };
 
+  const travel = async (action: 'undo' | 'redo' | 'seek', step?: number) => {
+    if (!wallState || isLoading) return;
+
+    setIsLoading(true);
+    try {
+      const res = await fetch(`http://localhost:8000/api/${action}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(step === undefined ? {} : { step }),
+      });
+      const data: StepResponse = await res.json();
+      showStep(data);
+    } catch (err) {
+      console.error(`Error on ${action}:`, err);
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
+  // Subscribed again after each render, so the handler sees the current state
   useEffect(() => {
     const handleKeyPress = (event: KeyboardEvent) => {
       if (event.key === 'Enter') handleNextBrick();
@@ -37,39 +115,36 @@ function App() {
 
     window.addEventListener('keypress', handleKeyPress);
     return () => window.removeEventListener('keypress', handleKeyPress);
-  }, [wallState, isLoading]);
+  });
 
   const initializeWall = async (e: React.FormEvent) => {
     e.preventDefault();
     
     try {
+      // Wildverband rows take a while to generate, show them as they are done
+      const progressive =
+        wallConfig.bond === 'wildverband' && PROGRESSIVE_MODES.includes(wallConfig.mode);
       const response = await fetch('http://localhost:8000/api/init', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(wallConfig),
+        body: JSON.stringify({ ...wallConfig, progressive }),
       });
-      setWallState(await response.json());
+      const data = await response.json();
+      if (!response.ok) {
+        setInitError(data.error);
+        return;
+      }
+      setInitError(null);
+      streamedRows.current = [];
+      setWallKey((key) => key + 1);
+      setWallState(data);
       setShowDialog(false);
+      if (data.rows_url) streamRows(data.rows_url);
     } catch (err) {
       console.error('Error initializing wall:', err);
     }
   };
 
-  const renderBrick = (brick: any, rowIndex: number, brickIndex: number) => (
-    <div
-      key={`${rowIndex}-${brickIndex}`}
-      className="brick"
-      style={{
-        width: `${brick.width * 1.33}rem`,
-        backgroundColor: brick.placed 
-          ? `hsl(${360 - (brick.stride || 0) * 50}, 80%, 50%)`
-          : '#e0e0e0',
-      }}
-    >
-      <span className="brick-label">{brick.stride}</span>
-    </div>
-  );
-
   return (
     <div className="app">
       {showDialog && (
@@ -84,6 +159,8 @@ function App() {
               >
                 <option value="left-to-right">Left to right</option>
                 <option value="optimal-strides">Optimal strides</option>
+                <option value="parallel-strides">Parallel strides</option>
+                <option value="travel-strides">Travel-aware strides</option>
               </select>
             </div>
             <div>
@@ -122,6 +199,7 @@ function App() {
             <div className="dimension-label">
               Height [mm] {wallConfig.height * 62.5}
             </div>
+            {initError && <div className="error-label">{initError}</div>}
             <button type="submit">Create Wall</button>
           </form>
         </div>
@@ -129,26 +207,12 @@ function App() {
 
       {wallState && (
         <div className="wall">
-          {[...wallState.bricks].reverse().map((row, rowIndex) => (
-            <div key={rowIndex} className="row">
-              {row.map((brick, brickIndex) => renderBrick(brick, rowIndex, brickIndex))}
-            </div>
-          ))}
-          {strideState && (
-            <div 
-              className="stride-overlay"
-              style={{
-                position: 'absolute',
-                left: `${strideState.origin_x * 1.33}rem`,
-                bottom: `${strideState.origin_y * 1.5}rem`,
-                width: `${strideState.width * 1.33}rem`,
-                height: `${strideState.height * 1.5}rem`,
-                border: '3px solid black',
-                backgroundColor: 'rgba(255, 0, 0, 0)',
-                pointerEvents: 'none',
-              }}
-            />
-          )}
+          <WallCanvas
+            key={wallKey}
+            wall={wallState}
+            stride={strideState}
+            changed={changedBricks}
+          />
         </div>
       )}
 
@@ -156,6 +220,40 @@ function App() {
         <span className="instruction-text">
           Press ↵ Return to continue
         </span>
+        {generation && !generation.done && (
+          <span className="instruction-text">
+            Generating rows {generation.rows} / {generation.height}
+          </span>
+        )}
+        {generation?.done && generation.violations !== null && (
+          <span className="instruction-text">
+            {generation.violations} pattern violations
+          </span>
+        )}
+        <div className="history-controls">
+          <button
+            onClick={() => travel('undo')}
+            disabled={history.step === 0}
+          >
+            Undo
+          </button>
+          <input
+            type="range"
+            min="0"
+            max={history.total}
+            value={history.step}
+            onChange={(e) => travel('seek', Number(e.target.value))}
+          />
+          <span className="instruction-text">
+            {history.step} / {history.total}
+          </span>
+          <button
+            onClick={() => travel('redo')}
+            disabled={history.step === history.total}
+          >
+            Redo
+          </button>
+        </div>
         <button 
           className="reset-button" 
           onClick={() => window.location.reload()}
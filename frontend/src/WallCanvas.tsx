@@ -0,0 +1,364 @@
+import { useEffect, useRef } from 'react';
+import { Brick, BrickPosition, ChangedBricks, Stride, WallState } from './types';
+
+// Size of a quarter brick and a row in pixels at zoom 1, like the former brick divs
+const UNIT_WIDTH = 21.28;
+const ROW_HEIGHT = 24;
+const BORDER = 2;
+const MIN_ZOOM = 0.01;
+const MAX_ZOOM = 8;
+// Above this many changed bricks a full repaint of the viewport is cheaper
+const MAX_CHANGED = 5000;
+
+interface Viewport {
+  // Top left corner of the view in wall pixels at zoom 1
+  x: number;
+  y: number;
+  zoom: number;
+}
+
+interface Layout {
+  wall: WallState;
+  // Left edge of each brick per row in quarter bricks, with a trailing right edge
+  edges: Int32Array[];
+  width: number;
+}
+
+const brickColor = (brick: Brick): string | null => {
+  if (brick.opening) return null;
+  if (!brick.placed) return '#e0e0e0';
+  return `hsl(${360 - (brick.stride || 0) * 50}, 80%, 50%)`;
+};
+
+const buildLayout = (wall: WallState): Layout => {
+  let width = 0;
+  const edges = wall.bricks.map((row) => {
+    const rowEdges = new Int32Array(row.length + 1);
+    for (let col = 0; col < row.length; col++) {
+      rowEdges[col + 1] = rowEdges[col] + row[col].width;
+    }
+    width = Math.max(width, rowEdges[row.length]);
+    return rowEdges;
+  });
+  return { wall, edges, width };
+};
+
+// Index of the last brick starting at or left of a position
+const brickAt = (edges: Int32Array, position: number): number => {
+  let low = 0;
+  let high = edges.length - 2;
+  while (low < high) {
+    const middle = (low + high + 1) >> 1;
+    if (edges[middle] <= position) low = middle;
+    else high = middle - 1;
+  }
+  return low;
+};
+
+/**
+ * Paints a wall on a canvas. Only bricks inside the viewport are drawn and after a
+ * step only the changed bricks are repainted.
+ */
+class WallPainter {
+  private readonly canvas: HTMLCanvasElement;
+  private layout: Layout | null = null;
+  private view: Viewport = { x: 0, y: 0, zoom: 1 };
+  private stride: Stride | null = null;
+  private frame: number | null = null;
+  // The view is fitted to the first layout with rows, later the user's view is kept
+  private fitted = false;
+  // Bricks to repaint in the next frame, null for a full repaint
+  private dirty: BrickPosition[] | null = null;
+
+  constructor(canvas: HTMLCanvasElement) {
+    this.canvas = canvas;
+  }
+
+  get viewport(): Viewport {
+    return this.view;
+  }
+
+  set viewport(view: Viewport) {
+    this.view = view;
+    this.schedule(null);
+  }
+
+  // Show a new wall, `changed` lists the bricks that differ from the drawn wall when known
+  update(wall: WallState, stride: Stride | null, changed: BrickPosition[] | null) {
+    const previous = this.layout;
+    // The stride outline overlaps bricks, repaint everything when it moved
+    const strideMoved = JSON.stringify(this.stride) !== JSON.stringify(stride);
+    // Rows keep their bricks, so the layout only changes with the number of rows
+    if (changed !== null && previous !== null && previous.edges.length === wall.bricks.length) {
+      this.layout = { ...previous, wall };
+    } else {
+      changed = null;
+      this.layout = buildLayout(wall);
+      if (!this.fitted) {
+        if (wall.bricks.length > 0) {
+          this.fitView();
+          this.fitted = true;
+        }
+      } else if (previous) {
+        // Rows are added on top, keep the bottom of the wall in place
+        const addedRows = wall.bricks.length - previous.edges.length;
+        this.view = { ...this.view, y: this.view.y + addedRows * ROW_HEIGHT };
+      }
+    }
+    this.stride = stride;
+    this.schedule(strideMoved ? null : changed);
+  }
+
+  // Keep the canvas backing store in sync with its size on screen
+  resize() {
+    const ratio = window.devicePixelRatio || 1;
+    this.canvas.width = Math.round(this.canvas.clientWidth * ratio);
+    this.canvas.height = Math.round(this.canvas.clientHeight * ratio);
+    this.schedule(null);
+  }
+
+  dispose() {
+    if (this.frame !== null) cancelAnimationFrame(this.frame);
+    this.frame = null;
+  }
+
+  private rowTop(row: number) {
+    return (this.layout!.edges.length - 1 - row) * ROW_HEIGHT;
+  }
+
+  private toScreen(x: number, y: number): [number, number] {
+    const { x: viewX, y: viewY, zoom } = this.view;
+    return [(x - viewX) * zoom, (y - viewY) * zoom];
+  }
+
+  private drawBrick(
+    context: CanvasRenderingContext2D,
+    brick: Brick,
+    left: number,
+    top: number,
+    width: number,
+    height: number,
+    detailed: boolean,
+  ) {
+    const color = brickColor(brick);
+    if (color === null) return;
+    if (!detailed) {
+      context.fillStyle = color;
+      context.fillRect(left, top, width, height);
+      return;
+    }
+    context.fillStyle = 'white';
+    context.fillRect(left, top, width, height);
+    context.fillStyle = color;
+    context.fillRect(left + BORDER, top + BORDER, width - 2 * BORDER, height - 2 * BORDER);
+    if (brick.stride !== null && width > 24) {
+      context.fillStyle = '#fff';
+      context.fillText(String(brick.stride), left + width / 2, top + height / 2);
+    }
+  }
+
+  private drawStride(context: CanvasRenderingContext2D) {
+    const current = this.stride;
+    if (!current) return;
+    const zoom = this.view.zoom;
+    const [left, top] = this.toScreen(
+      current.origin_x * UNIT_WIDTH,
+      this.rowTop(current.origin_y + current.height - 1),
+    );
+    context.strokeStyle = 'black';
+    context.lineWidth = 3;
+    context.strokeRect(left, top, current.width * UNIT_WIDTH * zoom, current.height * ROW_HEIGHT * zoom);
+  }
+
+  private drawAll(context: CanvasRenderingContext2D, width: number, height: number) {
+    const layout = this.layout!;
+    const { x: viewX, y: viewY, zoom } = this.view;
+    const rowHeight = ROW_HEIGHT * zoom;
+    const detailed = rowHeight >= 4 * BORDER;
+    context.clearRect(0, 0, width, height);
+
+    // Rows are drawn top to bottom, skip rows when they are thinner than a pixel
+    const rows = layout.edges.length;
+    const firstRow = Math.min(rows - 1, Math.floor((rows * ROW_HEIGHT - viewY) / ROW_HEIGHT));
+    const lastRow = Math.max(0, Math.floor((rows * ROW_HEIGHT - viewY - height / zoom) / ROW_HEIGHT));
+    const rowStep = Math.max(1, Math.floor(1 / rowHeight));
+    const leftPosition = viewX / UNIT_WIDTH;
+    const rightPosition = (viewX + width / zoom) / UNIT_WIDTH;
+
+    for (let row = firstRow; row >= lastRow; row -= rowStep) {
+      const edges = layout.edges[row];
+      const bricks = layout.wall.bricks[row];
+      if (bricks.length === 0 || edges[edges.length - 1] <= leftPosition) continue;
+      const top = (this.rowTop(row) - viewY) * zoom;
+      const drawnHeight = Math.max(rowHeight * rowStep, 1);
+      let col = brickAt(edges, Math.max(0, leftPosition));
+
+      if (detailed) {
+        for (; col < bricks.length && edges[col] < rightPosition; col++) {
+          const left = (edges[col] * UNIT_WIDTH - viewX) * zoom;
+          this.drawBrick(context, bricks[col], left, top, bricks[col].width * UNIT_WIDTH * zoom, rowHeight, true);
+        }
+        continue;
+      }
+      // Zoomed out, neighbouring bricks of the same color are drawn as one run
+      while (col < bricks.length && edges[col] < rightPosition) {
+        const color = brickColor(bricks[col]);
+        const start = col;
+        while (col < bricks.length && edges[col] < rightPosition && brickColor(bricks[col]) === color) {
+          col++;
+        }
+        if (color === null) continue;
+        context.fillStyle = color;
+        const left = (edges[start] * UNIT_WIDTH - viewX) * zoom;
+        context.fillRect(left, top, (edges[col] - edges[start]) * UNIT_WIDTH * zoom, drawnHeight);
+      }
+    }
+    this.drawStride(context);
+  }
+
+  private drawChanged(context: CanvasRenderingContext2D, changed: BrickPosition[]) {
+    const layout = this.layout!;
+    const rowHeight = ROW_HEIGHT * this.view.zoom;
+    const detailed = rowHeight >= 4 * BORDER;
+    for (const [row, col] of changed) {
+      const brick = layout.wall.bricks[row][col];
+      const [left, top] = this.toScreen(layout.edges[row][col] * UNIT_WIDTH, this.rowTop(row));
+      const width = brick.width * UNIT_WIDTH * this.view.zoom;
+      if (left + width < 0 || top + rowHeight < 0 || left > context.canvas.width || top > context.canvas.height) {
+        continue;
+      }
+      context.clearRect(left, top, width, rowHeight);
+      this.drawBrick(context, brick, left, top, width, Math.max(rowHeight, 1), detailed);
+    }
+  }
+
+  private paint() {
+    this.frame = null;
+    const context = this.canvas.getContext('2d');
+    if (!context || !this.layout) return;
+
+    const ratio = window.devicePixelRatio || 1;
+    context.setTransform(ratio, 0, 0, ratio, 0, 0);
+    context.font = '14px sans-serif';
+    context.textAlign = 'center';
+    context.textBaseline = 'middle';
+
+    const dirty = this.dirty;
+    this.dirty = null;
+    if (dirty === null) {
+      this.drawAll(context, this.canvas.clientWidth, this.canvas.clientHeight);
+    } else {
+      this.drawChanged(context, dirty);
+      this.drawStride(context);
+    }
+  }
+
+  private schedule(changed: BrickPosition[] | null) {
+    if (changed !== null && changed.length > MAX_CHANGED) changed = null;
+    if (this.frame !== null) {
+      // Merge with the pending frame, a full repaint covers everything
+      if (changed === null || this.dirty === null) this.dirty = null;
+      else this.dirty = this.dirty.concat(changed);
+      return;
+    }
+    this.dirty = changed;
+    this.frame = requestAnimationFrame(() => this.paint());
+  }
+
+  // Show the whole wall, aligned to the bottom left corner
+  private fitView() {
+    const layout = this.layout!;
+    const wallWidth = layout.width * UNIT_WIDTH;
+    const wallHeight = layout.edges.length * ROW_HEIGHT;
+    const zoom = Math.max(
+      MIN_ZOOM,
+      Math.min(1, this.canvas.clientWidth / wallWidth, this.canvas.clientHeight / wallHeight),
+    );
+    this.view = { x: 0, y: wallHeight - this.canvas.clientHeight / zoom, zoom };
+  }
+}
+
+/**
+ * Draw a wall on a canvas. `changed` lists the bricks of `wall` that changed since
+ * the previous wall, without it the whole wall is laid out again. Drag to pan,
+ * scroll to zoom.
+ */
+function WallCanvas({
+  wall,
+  stride,
+  changed,
+}: {
+  wall: WallState;
+  stride: Stride | null;
+  changed: ChangedBricks | null;
+}) {
+  const canvasRef = useRef<HTMLCanvasElement>(null);
+  const painterRef = useRef<WallPainter | null>(null);
+
+  // Create the painter, follow the canvas size, pan with the mouse and zoom around
+  // the cursor. Declared first, so the painter exists for the effect below.
+  useEffect(() => {
+    const canvas = canvasRef.current!;
+    const painter = new WallPainter(canvas);
+    painterRef.current = painter;
+    let dragStart: { x: number; y: number; viewX: number; viewY: number } | null = null;
+
+    const observer = new ResizeObserver(() => painter.resize());
+    const onWheel = (event: WheelEvent) => {
+      event.preventDefault();
+      const viewport = painter.viewport;
+      const zoom = Math.min(MAX_ZOOM, Math.max(MIN_ZOOM, viewport.zoom * Math.exp(-event.deltaY * 0.001)));
+      const rect = canvas.getBoundingClientRect();
+      const cursorX = event.clientX - rect.left;
+      const cursorY = event.clientY - rect.top;
+      painter.viewport = {
+        x: viewport.x + cursorX / viewport.zoom - cursorX / zoom,
+        y: viewport.y + cursorY / viewport.zoom - cursorY / zoom,
+        zoom,
+      };
+    };
+    const onPointerDown = (event: PointerEvent) => {
+      const { x, y } = painter.viewport;
+      dragStart = { x: event.clientX, y: event.clientY, viewX: x, viewY: y };
+      canvas.setPointerCapture(event.pointerId);
+    };
+    const onPointerMove = (event: PointerEvent) => {
+      if (!dragStart) return;
+      const zoom = painter.viewport.zoom;
+      painter.viewport = {
+        x: dragStart.viewX - (event.clientX - dragStart.x) / zoom,
+        y: dragStart.viewY - (event.clientY - dragStart.y) / zoom,
+        zoom,
+      };
+    };
+    const onPointerUp = () => {
+      dragStart = null;
+    };
+
+    observer.observe(canvas);
+    canvas.addEventListener('wheel', onWheel, { passive: false });
+    canvas.addEventListener('pointerdown', onPointerDown);
+    canvas.addEventListener('pointermove', onPointerMove);
+    canvas.addEventListener('pointerup', onPointerUp);
+    canvas.addEventListener('pointercancel', onPointerUp);
+    return () => {
+      observer.disconnect();
+      canvas.removeEventListener('wheel', onWheel);
+      canvas.removeEventListener('pointerdown', onPointerDown);
+      canvas.removeEventListener('pointermove', onPointerMove);
+      canvas.removeEventListener('pointerup', onPointerUp);
+      canvas.removeEventListener('pointercancel', onPointerUp);
+      painter.dispose();
+      painterRef.current = null;
+    };
+  }, []);
+
+  useEffect(() => {
+    const bricks = changed !== null && changed.wall === wall ? changed.bricks : null;
+    painterRef.current!.update(wall, stride, bricks);
+  }, [wall, stride, changed]);
+
+  return <canvas ref={canvasRef} className="wall-canvas" />;
+}
+
+export default WallCanvas;
@@ -2,6 +2,7 @@ export interface Brick {
   placed: boolean;
   width: number;
   stride: number | null;
+  opening: boolean;
 }
 
 export interface WallState {
@@ -16,9 +17,83 @@ export interface Stride {
   height: number;
 }
 
+export interface PlacementHistory {
+  step: number;
+  total: number;
+}
+
+// Position of a brick as [row, col]
+export type BrickPosition = [number, number];
+
+// Response of /api/next, /api/undo, /api/redo and /api/seek
+export interface StepResponse {
+  wall: WallState;
+  stride: Stride | null;
+  history: PlacementHistory;
+  // Bricks placed or reverted by the step
+  changed: BrickPosition[];
+  generation?: GenerationSummary;
+}
+
+// Bricks of a wall that changed since the wall shown before it
+export interface ChangedBricks {
+  wall: WallState;
+  bricks: BrickPosition[];
+}
+
+export interface Opening {
+  // Position and size in half bricks and rows
+  x: number;
+  y: number;
+  width: number;
+  height: number;
+  lintel?: boolean;
+}
+
 export interface InitializeRequest {
   width: number;
   height: number;
   mode: string;
   bond: string;
+  // Optional robot envelope and brick dimensions in millimeters
+  stride_width?: number;
+  stride_height?: number;
+  full_brick_width?: number;
+  course_height?: number;
+  // Materialize rows on demand, for very tall walls
+  lazy?: boolean;
+  openings?: Opening[];
+  // Used by the travel-strides mode
+  cost_model?: BuildCostModel;
+  // Also plan the greedy strides in the planned modes and report them
+  compare?: boolean;
+  // Return at once and stream the rows while they are generated
+  progressive?: boolean;
+}
+
+// Line of the /api/init/<wall_id>/rows stream for each generated row
+export interface RowEvent {
+  row: number;
+  bricks: Brick[];
+  violations: number | null;
+  progress: number;
+}
+
+// Last line of the rows stream, also part of /api/next while generating
+export interface GenerationSummary {
+  wall_id: string;
+  done: boolean;
+  rows: number;
+  height: number;
+  progress: number;
+  violations: number | null;
+  error: string | null;
+}
+
+// Seconds per quarter brick moved, per row lifted, per brick and per stride
+export interface BuildCostModel {
+  move_seconds?: number;
+  lift_seconds?: number;
+  brick_seconds?: number;
+  stride_seconds?: number;
 }
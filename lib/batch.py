@@ -0,0 +1,211 @@
+"""Solve many wall configurations from the command line.
+
+    python -m lib.batch jobs.csv -o results.csv --workers 8
+
+The jobs file is a CSV file with the columns width, height, bond, mode and seed,
+using the same units and names as /api/init.
+"""
+
+import csv
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from functools import partial
+
+import click
+
+from .bonds import BOND_NAMES, BrickWidth
+from .geometry import (
+    COURSE_HEIGHT,
+    FULL_BRICK_WIDTH,
+    STRIDE_HEIGHT,
+    STRIDE_WIDTH,
+    StrideEnvelope,
+)
+from .wall_state import Stride, WallState, build_with_strides
+
+MODES = ("left-to-right", "optimal-strides")
+
+
+@dataclass(frozen=True)
+class Job:
+    width: int
+    height: int
+    bond: str
+    mode: str
+    seed: int
+
+
+@dataclass
+class JobResult:
+    width: int
+    height: int
+    bond: str
+    mode: str
+    seed: int
+    bricks: int | None = None
+    strides: int | None = None
+    init_seconds: float | None = None
+    build_seconds: float | None = None
+    plan: str | None = None
+    # Set instead of the measurements if the job failed
+    error: str | None = None
+
+
+def read_jobs(path: str) -> list[Job]:
+    """Read and validate jobs from a CSV file."""
+    jobs = []
+    with open(path, newline="") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                job = Job(
+                    width=int(row["width"]),
+                    height=int(row["height"]),
+                    bond=row["bond"].strip(),
+                    mode=row["mode"].strip(),
+                    seed=int(row["seed"]),
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Invalid job on line {line}: {e}") from e
+            if job.width <= 0 or job.height <= 0:
+                raise ValueError(
+                    f"Invalid wall size on line {line}: {job.width}x{job.height}"
+                )
+            if job.bond not in BOND_NAMES:
+                raise ValueError(f"Invalid bond on line {line}: {job.bond}")
+            if job.mode not in MODES:
+                raise ValueError(f"Invalid mode on line {line}: {job.mode}")
+            jobs.append(job)
+    return jobs
+
+
+def run_job(
+    job: Job, envelope: StrideEnvelope, include_plan: bool = False
+) -> JobResult:
+    """Build a single wall to completion and measure it. A failing job returns a
+    result with the error, so the other jobs of a batch are kept."""
+    try:
+        return _run_job(job, envelope, include_plan)
+    except Exception as e:  # pylint: disable=broad-except
+        return JobResult(**asdict(job), error=f"{type(e).__name__}: {e}")
+
+
+def _run_job(job: Job, envelope: StrideEnvelope, include_plan: bool) -> JobResult:
+    random.seed(job.seed)
+
+    start = time.perf_counter()
+    wall = WallState()
+    wall.initialize_wall(job.width * BrickWidth.HALF, job.height, BOND_NAMES[job.bond])
+    init_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    strides: list[Stride] | None = None
+    if job.mode == "left-to-right":
+        bricks = sum(1 for _ in wall.place_bricks_left_to_right())
+    else:
+        strides = build_with_strides(wall, envelope.width, envelope.height)
+        bricks = len(wall.history.entries)
+    build_seconds = time.perf_counter() - start
+
+    return JobResult(
+        **asdict(job),
+        bricks=bricks,
+        strides=None if strides is None else len(strides),
+        init_seconds=init_seconds,
+        build_seconds=build_seconds,
+        plan=format_plan(strides) if include_plan and strides is not None else None,
+    )
+
+
+def run_jobs(
+    jobs: list[Job],
+    envelope: StrideEnvelope,
+    workers: int | None = None,
+    include_plans: bool = False,
+) -> list[JobResult]:
+    """Run jobs on a process pool, results are in the order of the jobs."""
+    run = partial(run_job, envelope=envelope, include_plan=include_plans)
+    if workers == 1:
+        return [run(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, jobs))
+
+
+def format_plan(strides: list[Stride]) -> str:
+    """Format stride origins as space separated x:y pairs."""
+    return " ".join(f"{stride.origin_x}:{stride.origin_y}" for stride in strides)
+
+
+def write_results(results: list[JobResult], path: str, output_format: str) -> None:
+    """Write results row by row as CSV or column by column as JSON."""
+    columns = [f.name for f in fields(JobResult)]
+    if output_format == "csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(asdict(result) for result in results)
+    elif output_format == "columns":
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    column: [getattr(result, column) for result in results]
+                    for column in columns
+                },
+                f,
+            )
+    else:
+        raise ValueError(f"Invalid output format: {output_format}")
+
+
+@click.command()
+@click.argument("jobs_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("-o", "--output", default="results.csv", help="Output file.")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["csv", "columns"]),
+    default="csv",
+    help="CSV rows or a JSON object of columns.",
+)
+@click.option(
+    "--workers", type=int, default=None, help="Worker processes, default all cores."
+)
+@click.option("--plans", is_flag=True, help="Include the stride origins per wall.")
+@click.option("--stride-width", type=float, default=STRIDE_WIDTH, help="[mm]")
+@click.option("--stride-height", type=float, default=STRIDE_HEIGHT, help="[mm]")
+@click.option("--full-brick-width", type=float, default=FULL_BRICK_WIDTH, help="[mm]")
+@click.option("--course-height", type=float, default=COURSE_HEIGHT, help="[mm]")
+def main(
+    jobs_file,
+    output,
+    output_format,
+    workers,
+    plans,
+    stride_width,
+    stride_height,
+    full_brick_width,
+    course_height,
+):
+    """Build all walls in JOBS_FILE and write stride counts and timings."""
+    try:
+        jobs = read_jobs(jobs_file)
+        envelope = StrideEnvelope(
+            stride_width, stride_height, full_brick_width, course_height
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+    start = time.perf_counter()
+    results = run_jobs(jobs, envelope, workers=workers, include_plans=plans)
+    write_results(results, output, output_format)
+    failed = sum(1 for result in results if result.error is not None)
+    click.echo(
+        f"Solved {len(results) - failed} walls in {time.perf_counter() - start:.2f}s, "
+        f"{failed} failed, results written to {output}"
+    )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from enum import Enum, IntEnum, auto
 from random import random
+from typing import Generator, Sequence
 
 
 class BrickWidth(IntEnum):
@@ -16,11 +17,21 @@ class Bond(Enum):
     WILD = auto()
 
 
+# Bond names as used by the API and the batch CLI
+BOND_NAMES = {
+    "stretcher": Bond.STRETCHER,
+    "flemish": Bond.FLEMISH,
+    "english": Bond.ENGLISH,
+    "wildverband": Bond.WILD,
+}
+
+
 @dataclass
 class Brick:
     placed: bool = False
     width: BrickWidth = BrickWidth.FULL
     stride: int | None = None
+    opening: bool = False
 
 
 def initialize_stretcher_bond(
@@ -112,10 +123,51 @@ def initialize_wild_bond(
     width_in_half_bricks: int,
     height_in_rows: int,
     max_attempts: int = 1000,
+    half_brick_probability: float = 0.2,
 ) -> list[list[Brick]]:
     """Initialize the wall with Wildverband pattern.
     https://www.joostdevree.nl/shtmls/wildverband.shtml
     """
+    return list(
+        iter_wild_bond_rows(
+            width_in_half_bricks,
+            height_in_rows,
+            max_attempts,
+            half_brick_probability=half_brick_probability,
+        )
+    )
+
+
+def iter_wild_bond_rows(
+    width_in_half_bricks: int,
+    height_in_rows: int,
+    max_attempts: int = 1000,
+    max_steps: int = 4,
+    half_brick_probability: float = 0.2,
+) -> Generator[list[Brick], None, None]:
+    """Generate the rows of a Wildverband pattern bottom to top.
+    Only the last `max_steps` rows are kept to check new rows against.
+    """
+    for bricks, _ in iter_checked_wild_bond_rows(
+        width_in_half_bricks,
+        height_in_rows,
+        max_attempts,
+        max_steps,
+        half_brick_probability,
+    ):
+        yield bricks
+
+
+def iter_checked_wild_bond_rows(
+    width_in_half_bricks: int,
+    height_in_rows: int,
+    max_attempts: int = 1000,
+    max_steps: int = 4,
+    half_brick_probability: float = 0.2,
+) -> Generator[tuple[list[Brick], int], None, None]:
+    """Generate the rows of a Wildverband pattern bottom to top, together with the
+    number of forbidden pattern positions of each row.
+    """
 
     def _create_row(
         is_even: bool, previous_row: list[Brick] | None, half_brick_probability: float
@@ -170,33 +222,32 @@ def initialize_wild_bond(
 
         return bricks
 
-    grid: list[list[Brick]] = [_create_row(True, None, 0.2)]
+    grid: list[list[Brick]] = [_create_row(True, None, half_brick_probability)]
+    yield (grid[0], 0)
 
     for row in range(1, height_in_rows):
         # Try multiple row configurations and select the best one
-        best_candidate = min(
+        (violations, best_candidate) = min(
             (
                 # Generate a row with random brick distributions
-                _create_row(
-                    is_even=row % 2 == 0,
-                    previous_row=grid[-1],
-                    half_brick_probability=0.2,
+                (_check_wildverband(grid, bricks, max_steps), bricks)
+                for bricks in (
+                    _create_row(
+                        is_even=row % 2 == 0,
+                        previous_row=grid[-1],
+                        half_brick_probability=half_brick_probability,
+                    )
+                    for _ in range(max_attempts)
                 )
-                for _ in range(max_attempts)
             ),
             # Choose the row with the fewest pattern violations
-            key=lambda bricks: _check_wildverband(grid, bricks),
+            key=lambda candidate: candidate[0],
         )
 
-        # If we found a perfect row (no violations), add it
-        if _check_wildverband(grid, best_candidate) == 0:
-            grid.append(best_candidate)
-            continue
-
-        # Otherwise, use the best row we could find
+        # Use the best row we could find, even if it has violations
         grid.append(best_candidate)
-
-    return grid
+        del grid[:-max_steps]
+        yield (best_candidate, violations)
 
 
 def _add_brick(bricks: list[Brick], remaining_width: int, brick: Brick) -> int:
@@ -227,6 +278,17 @@ def _bricks_have_head_joint_at_position(bricks: list[Brick], position: int) -> b
     return False
 
 
+def count_wildverband_violations(
+    rows: Sequence[list[Brick]], max_steps: int = 4
+) -> list[int]:
+    """Count the forbidden pattern positions of each row of a finished wall, the
+    same way rows are checked while they are generated."""
+    return [
+        _check_wildverband(list(rows[max(0, row - max_steps) : row]), bricks, max_steps)
+        for row, bricks in enumerate(rows)
+    ]
+
+
 def _check_wildverband(
     grid: list[list[Brick]], bricks: list[Brick], max_steps: int = 4
 ) -> int:
@@ -0,0 +1,100 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from math import floor
+from typing import Sequence
+
+from .bonds import Brick, BrickWidth
+
+FULL_BRICK_WIDTH = 220
+COURSE_HEIGHT = 65.5
+STRIDE_WIDTH = 800
+STRIDE_HEIGHT = 1300
+
+
+@dataclass(frozen=True)
+class StrideEnvelope:
+    """Physical dimensions of the robot envelope and the bricks, in millimeters."""
+
+    stride_width: float = STRIDE_WIDTH
+    stride_height: float = STRIDE_HEIGHT
+    full_brick_width: float = FULL_BRICK_WIDTH
+    course_height: float = COURSE_HEIGHT
+
+    def __post_init__(self):
+        dimensions = (
+            self.stride_width,
+            self.stride_height,
+            self.full_brick_width,
+            self.course_height,
+        )
+        if min(dimensions) <= 0:
+            raise ValueError("Stride and brick dimensions must be positive")
+        if self.width < BrickWidth.FULL or self.height < 1:
+            raise ValueError("Stride must fit at least one full brick and one course")
+
+    @property
+    def width(self) -> int:
+        """Stride width in wall units (quarter bricks)."""
+        return floor((self.stride_width / self.full_brick_width) * BrickWidth.FULL)
+
+    @property
+    def height(self) -> int:
+        """Stride height in rows."""
+        return floor(self.stride_height / self.course_height)
+
+
+class WallGeometry:
+    """Precomputed brick edges of a wall, used for interval lookups.
+
+    Row edges are computed on first access and cached, so the geometry of a
+    wall can be created up front without touching every row.
+    """
+
+    def __init__(self, bricks: Sequence[list[Brick]]):
+        self._bricks = bricks
+        self._edges: dict[int, list[int]] = {}
+
+    def row_edges(self, row: int) -> list[int]:
+        """Get the edges of all bricks in a row, starting at 0 and ending at the
+        row width."""
+        edges = self._edges.get(row)
+        if edges is None:
+            try:
+                row_bricks = self._bricks[row]
+            except IndexError as e:
+                raise ValueError(f"Row out of bounds: {row}") from e
+            edges = [0, *accumulate(brick.width for brick in row_bricks)]
+            self._edges[row] = edges
+        return edges
+
+    def forget(self, row: int) -> None:
+        """Drop the cached edges of a row."""
+        self._edges.pop(row, None)
+
+    def brick_edges(self, row: int, col: int) -> tuple[int, int]:
+        """Get distances to left and right edge of a brick in a row"""
+        edges = self.row_edges(row)
+        return (edges[col], edges[col + 1])
+
+    def bricks_at_position(self, row: int, position: int) -> tuple[int, ...]:
+        """Get the columns of the bricks touching a position in a row.
+
+        A position on a head joint touches the bricks on both sides of it.
+        """
+        edges = self.row_edges(row)
+        if position < 0 or position > edges[-1]:
+            return ()
+        col = bisect_right(edges, position) - 1
+        if col == len(edges) - 1:
+            return (col - 1,)  # right edge of the row
+        if position == edges[col] and col > 0:
+            return (col - 1, col)
+        return (col,)
+
+    def columns_in_window(self, row: int, origin_x: int, width: int) -> range:
+        """Get the columns of all bricks fully inside a horizontal window."""
+        edges = self.row_edges(row)
+        first = bisect_left(edges, origin_x)
+        last = bisect_right(edges, origin_x + width) - 1
+        return range(first, max(first, last))
@@ -0,0 +1,135 @@
+from bisect import bisect_right, insort
+from dataclasses import dataclass
+from typing import Sequence
+
+from .bonds import Brick, BrickWidth
+
+
+@dataclass(frozen=True)
+class Opening:
+    """Rectangular opening in the wall, e.g. a window or a door.
+
+    `x` and `width` are in wall units (quarter bricks), `y` and `height` in rows.
+    A lintel on top of the opening supports the bricks above it.
+    """
+
+    x: int
+    y: int
+    width: int
+    height: int
+    lintel: bool = True
+
+    @property
+    def right(self) -> int:
+        return self.x + self.width
+
+    @property
+    def top(self) -> int:
+        """First row above the opening."""
+        return self.y + self.height
+
+
+class OpeningIndex:
+    """Openings indexed by row, with sorted intervals for bisect lookups."""
+
+    def __init__(self, openings: Sequence[Opening] = ()):
+        self.openings = tuple(openings)
+        # row -> sorted (start, end) spans of the openings in that row
+        self._spans: dict[int, list[tuple[int, int]]] = {}
+        # row -> sorted (start, end) spans of the lintels on top of that row
+        self._lintels: dict[int, list[tuple[int, int]]] = {}
+
+        for opening in self.openings:
+            if opening.width <= 0 or opening.height <= 0:
+                raise ValueError(f"Opening must have a positive size: {opening}")
+            if opening.x < 0 or opening.y < 0:
+                raise ValueError(f"Opening out of bounds: {opening}")
+            for row in range(opening.y, opening.top):
+                spans = self._spans.setdefault(row, [])
+                if self._overlapping(spans, opening.x, opening.right):
+                    raise ValueError(f"Openings must not overlap: {opening}")
+                insort(spans, (opening.x, opening.right))
+            if opening.lintel:
+                insort(
+                    self._lintels.setdefault(opening.top - 1, []),
+                    (opening.x, opening.right),
+                )
+
+    def __bool__(self) -> bool:
+        return bool(self.openings)
+
+    def validate(self, width: int, height: int) -> None:
+        """Check that all openings fit into a wall and can be built over."""
+        for opening in self.openings:
+            if opening.right > width or opening.top > height:
+                raise ValueError(f"Opening out of bounds: {opening}")
+            if not opening.lintel and opening.top < height:
+                raise ValueError(
+                    f"Opening without lintel must reach the top of the wall: {opening}"
+                )
+        # A row without bricks would count as complete before anything is placed
+        for row, spans in self._spans.items():
+            if sum(end - start for start, end in spans) >= width:
+                raise ValueError(f"Openings must not cover the whole of row {row}")
+
+    def spans(self, row: int) -> list[tuple[int, int]]:
+        """Get the sorted spans of all openings in a row."""
+        return self._spans.get(row, [])
+
+    def lintel_supports(self, row: int, position: int) -> bool:
+        """Check if a lintel on top of a row supports a position.
+
+        Lintels support the whole opening including its edges, so openings at the
+        edge of the wall are supported where there is no brick next to them.
+        """
+        spans = self._lintels.get(row)
+        if not spans:
+            return False
+        i = bisect_right(spans, position, key=lambda span: span[0]) - 1
+        return i >= 0 and spans[i][0] <= position <= spans[i][1]
+
+    @staticmethod
+    def _overlapping(spans: list[tuple[int, int]], start: int, end: int) -> bool:
+        i = bisect_right(spans, (start, end))
+        return (i > 0 and spans[i - 1][1] > start) or (
+            i < len(spans) and spans[i][0] < end
+        )
+
+
+def cut_row(bricks: list[Brick], spans: list[tuple[int, int]]) -> list[Brick]:
+    """Cut the bricks of a row around the given opening spans.
+
+    Both the remaining pieces and the openings are split into the largest possible
+    brick widths, openings are marked with `Brick.opening`.
+    """
+    if not spans:
+        return bricks
+
+    cut: list[Brick] = []
+    left_edge = 0
+    for brick in bricks:
+        right_edge = left_edge + brick.width
+        position = left_edge
+        for start, end in spans:
+            if end <= position or start >= right_edge:
+                continue
+            if start > position:
+                _add_pieces(cut, start - position, opening=False)
+            hole_start = max(start, position)
+            position = min(end, right_edge)
+            _add_pieces(cut, position - hole_start, opening=True)
+        if position < right_edge:
+            if position == left_edge:
+                cut.append(brick)  # brick is not touched by any opening
+            else:
+                _add_pieces(cut, right_edge - position, opening=False)
+        left_edge = right_edge
+    return cut
+
+
+def _add_pieces(bricks: list[Brick], width: int, opening: bool) -> None:
+    """Fill a width with the largest possible bricks"""
+    for brick_width in sorted(BrickWidth, reverse=True):
+        while width >= brick_width:
+            bricks.append(Brick(width=brick_width, opening=opening))
+            width -= brick_width
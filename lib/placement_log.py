@@ -0,0 +1,95 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Sequence
+
+_NO_STRIDE = -1
+
+
+@dataclass(frozen=True)
+class Placement:
+    row: int
+    col: int
+    stride: int | None
+    sequence: int
+
+
+class PlacementEntries(Sequence[Placement]):
+    """Read only view of the placements in a log, built on access."""
+
+    def __init__(self, log: "PlacementLog"):
+        self._log = log
+
+    def __len__(self) -> int:
+        return len(self._log.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Placement out of bounds: {index}")
+        stride = self._log.strides[index]
+        return Placement(
+            self._log.rows[index],
+            self._log.cols[index],
+            None if stride == _NO_STRIDE else stride,
+            index,
+        )
+
+
+@dataclass
+class PlacementLog:
+    """Append-only log of placed bricks with a cursor for undo and redo.
+
+    Entries after the cursor are undone placements that can be redone. Recording a
+    new placement discards them. Placements are packed into one array per field,
+    12 bytes per brick.
+    """
+
+    rows: array = field(default_factory=lambda: array("i"), repr=False)
+    cols: array = field(default_factory=lambda: array("i"), repr=False)
+    strides: array = field(default_factory=lambda: array("i"), repr=False)
+    position: int = 0
+
+    @property
+    def entries(self) -> PlacementEntries:
+        return PlacementEntries(self)
+
+    @property
+    def can_undo(self) -> bool:
+        return self.position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self.position < len(self.rows)
+
+    def record(self, row: int, col: int, stride: int | None) -> Placement:
+        """Append a placement at the cursor, dropping any undone placements."""
+        if self.can_redo:
+            for values in (self.rows, self.cols, self.strides):
+                del values[self.position :]
+        self.rows.append(row)
+        self.cols.append(col)
+        self.strides.append(_NO_STRIDE if stride is None else stride)
+        self.position += 1
+        return Placement(row, col, stride, self.position - 1)
+
+    def undo(self) -> Placement | None:
+        """Move the cursor back and return the placement to revert."""
+        if not self.can_undo:
+            return None
+        self.position -= 1
+        return self.entries[self.position]
+
+    def redo(self) -> Placement | None:
+        """Move the cursor forward and return the placement to reapply."""
+        if not self.can_redo:
+            return None
+        self.position += 1
+        return self.entries[self.position - 1]
+
+    def clear(self) -> None:
+        for values in (self.rows, self.cols, self.strides):
+            del values[:]
+        self.position = 0
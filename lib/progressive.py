@@ -0,0 +1,129 @@
+import threading
+from dataclasses import replace
+from typing import Generator, Iterator
+from uuid import uuid4
+
+from .bonds import Bond, Brick, iter_checked_wild_bond_rows
+from .openings import OpeningIndex, cut_row
+from .rows import BondRowProvider
+from .wall_state import WallState, brick_to_dict
+
+
+def iter_bond_rows(
+    width_in_half_bricks: int,
+    height_in_rows: int,
+    bond: Bond,
+    openings: OpeningIndex | None = None,
+) -> Iterator[tuple[list[Brick], int | None]]:
+    """Generate the rows of a bond bottom to top, cut around the openings.
+
+    Each row comes with its number of Wildverband pattern violations, None for the
+    other bonds.
+    """
+    openings = openings or OpeningIndex()
+    if bond == Bond.WILD:
+        rows = iter_checked_wild_bond_rows(width_in_half_bricks, height_in_rows)
+        for row, (bricks, violations) in enumerate(rows):
+            yield (cut_row(bricks, openings.spans(row)), violations)
+        return
+
+    provider = BondRowProvider(width_in_half_bricks, height_in_rows, bond, openings)
+    for row in range(height_in_rows):
+        yield (provider.bricks(row), None)
+
+
+class ProgressiveWall:
+    """Rows of a wall generated on a background thread.
+
+    Finished rows are kept in order, so they can be streamed to any number of
+    clients and added to the `WallState` that is being built.
+    """
+
+    def __init__(
+        self, height_in_rows: int, rows: Iterator[tuple[list[Brick], int | None]]
+    ):
+        self.wall_id = uuid4().hex
+        self.height = height_in_rows
+        self.rows: list[list[Brick]] = []
+        self.violations: list[int | None] = []
+        self.error: str | None = None
+        self.done = False
+        self._cancelled = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._generate, args=(rows,), daemon=True
+        )
+
+    def start(self) -> "ProgressiveWall":
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        """Stop generating after the current row."""
+        self._cancelled = True
+
+    @property
+    def progress(self) -> float:
+        return len(self.rows) / self.height
+
+    def sync(self, wall: WallState) -> int:
+        """Add all rows finished since the last sync to a wall. Return the number of
+        added rows."""
+        with self._condition:
+            rows = self.rows[wall.height :]
+        for bricks in rows:
+            # Copies, so placing bricks does not change the rows being streamed
+            wall.append_row([replace(brick) for brick in bricks])
+        return len(rows)
+
+    def events(self, timeout: float = 30.0) -> Generator[dict, None, None]:
+        """Yield every finished row as it becomes available, starting with the
+        first one, followed by a summary once generation has ended."""
+        row = 0
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: len(self.rows) > row or self.done, timeout
+                )
+                rows = self.rows[row:]
+                violations = self.violations[row:]
+                done = self.done
+            for bricks, row_violations in zip(rows, violations):
+                row += 1
+                yield {
+                    "row": row - 1,
+                    "bricks": [brick_to_dict(brick) for brick in bricks],
+                    "violations": row_violations,
+                    "progress": row / self.height,
+                }
+            if done and row == len(self.rows):
+                break
+        yield self.summary()
+
+    def summary(self) -> dict:
+        known = [v for v in self.violations if v is not None]
+        return {
+            "wall_id": self.wall_id,
+            "done": self.done,
+            "rows": len(self.rows),
+            "height": self.height,
+            "progress": self.progress,
+            "violations": sum(known) if known else None,
+            "error": self.error,
+        }
+
+    def _generate(self, rows: Iterator[tuple[list[Brick], int | None]]) -> None:
+        try:
+            for bricks, violations in rows:
+                if self._cancelled:
+                    break
+                with self._condition:
+                    self.rows.append(bricks)
+                    self.violations.append(violations)
+                    self._condition.notify_all()
+        except Exception as e:  # pylint: disable=broad-except
+            self.error = str(e)
+        finally:
+            with self._condition:
+                self.done = True
+                self._condition.notify_all()
@@ -0,0 +1,184 @@
+from array import array
+from typing import Iterator, Protocol, Sequence
+
+from .bonds import (
+    Bond,
+    Brick,
+    BrickWidth,
+    initialize_english_bond,
+    initialize_flemish_bond,
+    initialize_stretcher_bond,
+    iter_wild_bond_rows,
+)
+from .openings import OpeningIndex, cut_row
+
+_BRICK_WIDTHS = {width.value: width for width in BrickWidth}
+
+
+class RowProvider(Protocol):
+    """Builds the bricks of any row of a wall on demand."""
+
+    height: int
+    # Width of the wall in quarter bricks
+    width: int
+
+    def bricks(self, row: int) -> list[Brick]:
+        ...
+
+    def is_row_complete(self, row: int) -> bool:
+        """Check if all bricks of a row are placed without building it."""
+        ...
+
+    def clear(self) -> None:
+        """Forget all placements, later rows are built unplaced."""
+        ...
+
+
+class BondRowProvider:
+    """Provides the brick widths of any row of a bond pattern.
+
+    Stretcher, flemish and english bonds repeat every two rows, so only two template
+    rows are kept. Wildverband rows are generated in order on first access and kept
+    as one byte per brick. Bricks are cut around openings when a row is built.
+    """
+
+    def __init__(
+        self,
+        width_in_half_bricks: int,
+        height_in_rows: int,
+        bond: Bond,
+        openings: OpeningIndex | None = None,
+    ):
+        self.height = height_in_rows
+        self.width = width_in_half_bricks
+        self.openings = openings or OpeningIndex()
+        self._templates: list[bytes] = []
+        self._wild_rows: list[bytes] = []
+        self._wild_generator = None
+
+        if bond == Bond.WILD:
+            self._wild_generator = iter_wild_bond_rows(
+                width_in_half_bricks, height_in_rows
+            )
+            return
+
+        if bond == Bond.FLEMISH:
+            template = initialize_flemish_bond(width_in_half_bricks, 2)
+        elif bond == Bond.ENGLISH:
+            template = initialize_english_bond(width_in_half_bricks, 2)
+        else:
+            template = initialize_stretcher_bond(width_in_half_bricks, 2)
+        self._templates = [_row_widths(row) for row in template]
+
+    def widths(self, row: int) -> bytes:
+        """Get the brick widths of a row, one byte per brick."""
+        if not 0 <= row < self.height:
+            raise IndexError(f"Row out of bounds: {row}")
+        if self._wild_generator is None:
+            return self._templates[row % 2]
+        while len(self._wild_rows) <= row:
+            self._wild_rows.append(_row_widths(next(self._wild_generator)))
+        return self._wild_rows[row]
+
+    def bricks(self, row: int) -> list[Brick]:
+        """Build the unplaced bricks of a row."""
+        bricks = [Brick(width=_BRICK_WIDTHS[width]) for width in self.widths(row)]
+        return cut_row(bricks, self.openings.spans(row))
+
+    def is_row_complete(self, row: int) -> bool:
+        return False  # rows are built unplaced and never consist of openings only
+
+    def clear(self) -> None:
+        pass
+
+
+class LazyRows(Sequence[list[Brick]]):
+    """Rows of bricks that are materialized on first access.
+
+    Fully placed rows can be compacted to the strides they were placed with and are
+    materialized again when accessed. Iterating does not materialize rows, so
+    changes to bricks must go through indexing.
+    """
+
+    def __init__(self, provider: RowProvider):
+        self._provider = provider
+        self._rows: dict[int, list[Brick]] = {}
+        self._placed_strides: dict[int, array] = {}
+
+    def __len__(self) -> int:
+        return self._provider.height
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        row = self._normalize(index)
+        bricks = self._rows.get(row)
+        if bricks is None:
+            bricks = self._build_row(row)
+            self._placed_strides.pop(row, None)
+            self._rows[row] = bricks
+        return bricks
+
+    def __iter__(self) -> Iterator[list[Brick]]:
+        for row in range(len(self)):
+            bricks = self._rows.get(row)
+            yield bricks if bricks is not None else self._build_row(row)
+
+    @property
+    def width(self) -> int:
+        """Width of the wall, without materializing a row."""
+        return self._provider.width
+
+    @property
+    def materialized_rows(self) -> int:
+        return len(self._rows)
+
+    def is_row_complete(self, row: int) -> bool:
+        """Check if all bricks of a row are placed without materializing it."""
+        if row in self._placed_strides:
+            return True
+        bricks = self._rows.get(row)
+        if bricks is None:
+            return self._provider.is_row_complete(row)
+        return all(brick.placed or brick.opening for brick in bricks)
+
+    def compact_below(self, row: int) -> list[int]:
+        """Drop all fully placed rows below `row` down to their strides. Return
+        the compacted rows."""
+        compacted = []
+        for candidate in [r for r in self._rows if r < row]:
+            bricks = self._rows[candidate]
+            if all(brick.placed or brick.opening for brick in bricks):
+                self._placed_strides[candidate] = array(
+                    "i",
+                    (-1 if brick.stride is None else brick.stride for brick in bricks),
+                )
+                del self._rows[candidate]
+                compacted.append(candidate)
+        return compacted
+
+    def clear(self) -> None:
+        """Forget all placements."""
+        self._rows.clear()
+        self._placed_strides.clear()
+        self._provider.clear()
+
+    def _normalize(self, index: int) -> int:
+        row = index + len(self) if index < 0 else index
+        if not 0 <= row < len(self):
+            raise IndexError(f"Row out of bounds: {index}")
+        return row
+
+    def _build_row(self, row: int) -> list[Brick]:
+        bricks = self._provider.bricks(row)
+        strides = self._placed_strides.get(row)
+        if strides is not None:
+            for brick, stride in zip(bricks, strides):
+                if not brick.opening:
+                    brick.placed = True
+                    brick.stride = None if stride == -1 else stride
+        return bricks
+
+
+def _row_widths(bricks: list[Brick]) -> bytes:
+    return bytes(brick.width for brick in bricks)
@@ -0,0 +1,290 @@
+import os
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from dataclasses import dataclass
+from itertools import repeat
+from math import ceil
+
+from .bonds import Brick, BrickWidth
+from .openings import Opening, OpeningIndex
+from .rows import LazyRows
+from .wall_state import (
+    Stride,
+    WallState,
+    best_stride_origin_x,
+    build_with_strides,
+    find_best_stride,
+)
+
+
+@dataclass
+class SegmentedPlan:
+    """Stride plan of a wall planned in independent vertical segments."""
+
+    strides: list[Stride]
+    bricks_per_stride: list[int]
+    segment_strides: list[int]
+    seam_strides: int
+    seconds: float
+    greedy_strides: int | None = None
+
+
+@dataclass
+class SegmentRows:
+    """Packed bricks of a wall band that touch a (left, right) window.
+
+    This is all a segment needs to be planned, sent to the worker processes instead
+    of the whole wall. Rows start at row `y` and are shifted left by `x`, the
+    leftmost edge of the cropped bricks. Per row, `fillers` holds the width left of
+    the first cropped brick, which is at most a full brick, and `lengths` the number
+    of bricks. Widths and flags are one byte per brick.
+    """
+
+    x: int
+    y: int
+    fillers: bytes
+    lengths: array
+    widths: bytes
+    placed: bytes
+    opening: bytes
+    openings: tuple[Opening, ...]
+
+    @classmethod
+    def crop(
+        cls, wall: WallState, window: tuple[int, int], rows: range
+    ) -> "SegmentRows":
+        (left, right) = window
+        spans = []
+        for row in rows:
+            # Bricks ending on the left or starting on the right window edge
+            # support bricks inside the window
+            edges = wall.geometry.row_edges(row)
+            first = max(bisect_left(edges, left) - 1, 0)
+            last = min(bisect_right(edges, right), len(edges) - 1)
+            spans.append((edges[first], first, last))
+        x = min((offset for (offset, _, _) in spans), default=0)
+
+        lengths = array("i")
+        (fillers, widths, placed, opening) = (
+            bytearray(),
+            bytearray(),
+            bytearray(),
+            bytearray(),
+        )
+        for row, (offset, first, last) in zip(rows, spans):
+            bricks = wall.bricks[row][first:last]
+            fillers.append(offset - x)
+            lengths.append(len(bricks))
+            widths.extend(brick.width for brick in bricks)
+            placed.extend(brick.placed for brick in bricks)
+            opening.extend(brick.opening for brick in bricks)
+
+        # Openings in the cropped coordinates, clipped to the rows and the left edge
+        openings = []
+        for o in wall.openings.openings:
+            (ox, oy) = (max(o.x - x, 0), max(o.y - rows.start, 0))
+            (width, height) = (o.right - x - ox, o.top - rows.start - oy)
+            if width > 0 and height > 0:
+                openings.append(Opening(ox, oy, width, height, o.lintel))
+
+        return cls(
+            x,
+            rows.start,
+            bytes(fillers),
+            lengths,
+            bytes(widths),
+            bytes(placed),
+            bytes(opening),
+            tuple(openings),
+        )
+
+    def to_wall(self) -> WallState:
+        """Build a wall of the cropped rows. Each row starts with placed filler
+        bricks up to its first cropped brick."""
+        rows = []
+        start = 0
+        for filler, length in zip(self.fillers, self.lengths):
+            row = []
+            for piece in sorted(BrickWidth, reverse=True):
+                while filler >= piece:
+                    row.append(Brick(placed=True, width=piece))
+                    filler -= piece
+            row.extend(
+                Brick(
+                    placed=bool(self.placed[col]),
+                    width=BrickWidth(self.widths[col]),
+                    opening=bool(self.opening[col]),
+                )
+                for col in range(start, start + length)
+            )
+            rows.append(row)
+            start += length
+        wall = WallState(bricks=rows)
+        wall.openings = OpeningIndex(self.openings)
+        return wall
+
+    def plan(
+        self,
+        window: tuple[int, int],
+        band: tuple[int, int],
+        stride_width: int,
+        stride_height: int,
+    ) -> list[Stride]:
+        """Plan the segment on the cropped rows, window, band and the returned
+        strides are in wall coordinates."""
+        strides = plan_segment(
+            self.to_wall(),
+            (window[0] - self.x, window[1] - self.x),
+            stride_width,
+            stride_height,
+            (band[0] - self.y, band[1] - self.y),
+        )
+        return [
+            Stride(
+                s.origin_x + self.x, s.origin_y + self.y, stride_width, stride_height
+            )
+            for s in strides
+        ]
+
+
+def plan_segment(
+    wall: WallState,
+    window: tuple[int, int],
+    stride_width: int,
+    stride_height: int,
+    band: tuple[int, int] | None = None,
+) -> list[Stride]:
+    """Greedily place strides that fit inside a (left, right) window.
+
+    Bricks crossing the window edges are left for the seam pass. The segment stops
+    once its lowest incomplete row is blocked by them, building above a blocked row
+    fragments the plan into many small strides. With a (bottom, top) band, rows
+    below the bottom are known to be complete and strides only start below the top.
+    """
+    (bottom, top) = band or (0, wall.height)
+    origins = range(window[0], window[1] - stride_width + 1)
+    strides = []
+    row = wall.first_incomplete_row(window, start=bottom)
+    while row is not None and row < top:
+        (x, num_bricks) = best_stride_origin_x(
+            wall, row, stride_width, stride_height, origins
+        )
+        if num_bricks == 0:
+            break
+        stride = Stride(x, row, stride_width, stride_height)
+        list(wall.place_bricks_for_stride(stride))
+        strides.append(stride)
+        row = wall.first_incomplete_row(window, start=row)
+    return strides
+
+
+def plan_in_segments(
+    wall: WallState,
+    stride_width: int,
+    stride_height: int,
+    segments: int | None = None,
+    workers: int | None = None,
+    compare: bool = False,
+) -> SegmentedPlan:
+    """Plan the strides for a wall by splitting it into vertical segments along
+    stride width boundaries and planning each segment in a separate process.
+
+    The wall is planned in horizontal bands of one stride height. The segment plans
+    of a band are replayed on one wall, support only grows with placed bricks so
+    each replayed stride is valid. The bricks along the seams of the band are then
+    planned greedily in strips around each seam before the next band is sent to the
+    workers. The wall itself is not modified.
+    """
+    if isinstance(wall.bricks, LazyRows):
+        raise ValueError("Walls with lazy rows can not be planned in segments")
+
+    start = time.perf_counter()
+    segments = segments or os.cpu_count() or 1
+    segment_width = ceil(wall.width / segments / stride_width) * stride_width
+    windows = [
+        (left, min(left + segment_width, wall.width))
+        for left in range(0, wall.width, segment_width)
+    ]
+    # The last segment may be narrower than a stride, strides can reach beyond
+    # the wall like in the greedy search
+    windows[-1] = (windows[-1][0], max(windows[-1][1], windows[-1][0] + stride_width))
+    # Strips of strides that touch a seam
+    strips = [(left - stride_width, left + stride_width) for (left, _) in windows[1:]]
+
+    merged = deepcopy(wall)
+    strides = []
+    bricks_per_stride = []
+    segment_strides = [0] * len(windows)
+    seam_strides = 0
+
+    def place(stride: Stride) -> bool:
+        num_bricks = len(list(merged.place_bricks_for_stride(stride)))
+        if num_bricks:
+            strides.append(stride)
+            bricks_per_stride.append(num_bricks)
+        return num_bricks > 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        bottom = merged.first_incomplete_row()
+        while bottom is not None:
+            band = (bottom, bottom + stride_height)
+            # Workers only get the bricks around their window, from the complete
+            # row below the band up to the top of the highest stride
+            rows = range(
+                max(bottom - 1, 0), min(band[1] + stride_height - 1, merged.height)
+            )
+            segment_plans = executor.map(
+                SegmentRows.plan,
+                [SegmentRows.crop(merged, window, rows) for window in windows],
+                windows,
+                repeat(band),
+                repeat(stride_width),
+                repeat(stride_height),
+            )
+
+            # Replay segment plans, strides that have nothing left to place are
+            # dropped
+            placed = 0
+            for segment, plan in enumerate(segment_plans):
+                for stride in plan:
+                    if place(stride):
+                        segment_strides[segment] += 1
+                        placed += 1
+
+            for strip in strips:
+                origins = range(strip[0], strip[1] - stride_width + 1)
+                row = merged.first_incomplete_row(strip, start=bottom)
+                while row is not None and row < band[1]:
+                    (x, _) = best_stride_origin_x(
+                        merged, row, stride_width, stride_height, origins
+                    )
+                    if not place(Stride(x, row, stride_width, stride_height)):
+                        break
+                    seam_strides += 1
+                    placed += 1
+                    row = merged.first_incomplete_row(strip, start=row)
+
+            # A band blocked by bricks wider than the strips continues with the
+            # greedy search over the whole wall
+            if not placed:
+                stride = find_best_stride(merged, stride_width, stride_height)
+                if not place(stride):
+                    raise ValueError(f"No brick can be placed with stride {stride}")
+                seam_strides += 1
+            bottom = merged.first_incomplete_row(start=bottom)
+
+    plan = SegmentedPlan(
+        strides=strides,
+        bricks_per_stride=bricks_per_stride,
+        segment_strides=segment_strides,
+        seam_strides=seam_strides,
+        seconds=time.perf_counter() - start,
+    )
+    if compare:
+        plan.greedy_strides = len(
+            build_with_strides(deepcopy(wall), stride_width, stride_height)
+        )
+    return plan
@@ -0,0 +1,199 @@
+"""Compact binary snapshots of a wall.
+
+Layout (little endian):
+    header      magic, format version, number of rows, current stride, then float64
+                stride width, stride height, full brick width and course height in mm
+    row_lengths uint32 per row
+    widths      uint8 per brick
+    flags       uint8 per brick, bit 0 placed, bit 1 opening
+    strides     int32 per brick, -1 for bricks without a stride
+    openings    int32 count, then int32 x, y, width, height, lintel per opening
+
+Restored walls keep the packed bricks and build rows only when they are accessed.
+"""
+
+import os
+import struct
+import sys
+from array import array
+from itertools import accumulate
+
+from .bonds import Brick, BrickWidth
+from .geometry import StrideEnvelope
+from .openings import Opening, OpeningIndex
+from .rows import LazyRows
+from .wall_state import WallState
+
+MAGIC = b"WALL"
+VERSION = 1
+_HEADER = struct.Struct("<4sHIi")
+_ENVELOPE = struct.Struct("<4d")
+_NO_STRIDE = -1
+_PLACED = 1
+_OPENING = 2
+_BRICK_WIDTHS = {width.value: width for width in BrickWidth}
+# Flags of a brick after a reset, only openings are kept
+_RESET_FLAGS = bytes(value & _OPENING for value in range(256))
+
+
+class SnapshotRowProvider:
+    """Builds the bricks of a row from the packed arrays of a snapshot."""
+
+    def __init__(self, row_lengths: array, widths: bytes, flags: bytes, strides: array):
+        self.height = len(row_lengths)
+        self._offsets = array("q", accumulate(row_lengths, initial=0))
+        self.width = sum(widths[: self._offsets[1]]) if self.height else 0
+        self._widths = widths
+        self._flags = flags
+        self._strides = strides
+
+    def bricks(self, row: int) -> list[Brick]:
+        (start, end) = self._span(row)
+        return [
+            Brick(
+                placed=bool(flags & _PLACED),
+                width=_BRICK_WIDTHS[width],
+                stride=None if stride == _NO_STRIDE else stride,
+                opening=bool(flags & _OPENING),
+            )
+            for width, flags, stride in zip(
+                self._widths[start:end],
+                self._flags[start:end],
+                self._strides[start:end],
+            )
+        ]
+
+    def is_row_complete(self, row: int) -> bool:
+        (start, end) = self._span(row)
+        return all(flags & (_PLACED | _OPENING) for flags in self._flags[start:end])
+
+    def clear(self) -> None:
+        self._flags = self._flags.translate(_RESET_FLAGS)
+        self._strides = array("i", [_NO_STRIDE]) * len(self._strides)
+
+    def _span(self, row: int) -> tuple[int, int]:
+        if not 0 <= row < self.height:
+            raise IndexError(f"Row out of bounds: {row}")
+        return (self._offsets[row], self._offsets[row + 1])
+
+
+def save_snapshot(
+    wall: WallState, path: str, envelope: StrideEnvelope | None = None
+) -> None:
+    """Write the wall and the stride dimensions it is built with to a snapshot
+    file, replacing it atomically."""
+    envelope = envelope or StrideEnvelope()
+    row_lengths = array("I", (len(row) for row in wall.bricks))
+    widths = bytearray()
+    flags = bytearray()
+    strides = array("i")
+    for row in wall.bricks:
+        widths.extend(brick.width for brick in row)
+        flags.extend(
+            (_PLACED if brick.placed else 0) | (_OPENING if brick.opening else 0)
+            for brick in row
+        )
+        strides.extend(
+            _NO_STRIDE if brick.stride is None else brick.stride for brick in row
+        )
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(row_lengths), wall.current_stride))
+        f.write(
+            _ENVELOPE.pack(
+                envelope.stride_width,
+                envelope.stride_height,
+                envelope.full_brick_width,
+                envelope.course_height,
+            )
+        )
+        f.write(_little_endian(row_lengths).tobytes())
+        f.write(widths)
+        f.write(flags)
+        f.write(_little_endian(strides).tobytes())
+        f.write(_little_endian(_pack_openings(wall.openings)).tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str) -> tuple[WallState, StrideEnvelope]:
+    """Read a wall and its stride dimensions from a snapshot file.
+
+    Bricks are built when their row is accessed, derived indexes are rebuilt lazily.
+    """
+    with open(path, "rb") as f:
+        data = memoryview(f.read())
+
+    try:
+        magic, version, height, current_stride = _HEADER.unpack_from(data)
+    except struct.error as e:
+        raise ValueError(f"Not a wall snapshot: {path}") from e
+    if magic != MAGIC:
+        raise ValueError(f"Not a wall snapshot: {path}")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+
+    try:
+        envelope = StrideEnvelope(*_ENVELOPE.unpack_from(data, _HEADER.size))
+    except struct.error as e:
+        raise ValueError("Truncated wall snapshot") from e
+    offset = _HEADER.size + _ENVELOPE.size
+
+    row_lengths = _read_array("I", data, offset, height)
+    offset += height * row_lengths.itemsize
+    total = sum(row_lengths)
+    widths = bytes(data[offset : offset + total])
+    flags = bytes(data[offset + total : offset + 2 * total])
+    strides = _read_array("i", data, offset + 2 * total, total)
+    offset += 2 * total + total * strides.itemsize
+    openings = _read_openings(data, offset)
+
+    invalid = widths.translate(None, bytes(_BRICK_WIDTHS))
+    if invalid:
+        raise ValueError(f"Invalid brick width in snapshot: {invalid[0]}")
+
+    provider = SnapshotRowProvider(row_lengths, widths, flags, strides)
+    try:
+        opening_index = OpeningIndex(openings)
+        opening_index.validate(provider.width, height)
+    except ValueError as e:
+        raise ValueError(f"Invalid opening in snapshot: {e}") from e
+
+    wall = WallState(bricks=LazyRows(provider), current_stride=current_stride)
+    wall.openings = opening_index
+    return (wall, envelope)
+
+
+def _pack_openings(openings: OpeningIndex) -> array:
+    values = array("i", [len(openings.openings)])
+    for opening in openings.openings:
+        values.extend(
+            (opening.x, opening.y, opening.width, opening.height, opening.lintel)
+        )
+    return values
+
+
+def _read_openings(data: memoryview, offset: int) -> list[Opening]:
+    (count,) = _read_array("i", data, offset, 1)
+    values = _read_array("i", data, offset + 4, 5 * count)
+    return [
+        Opening(*values[i : i + 4], lintel=bool(values[i + 4]))
+        for i in range(0, len(values), 5)
+    ]
+
+
+def _read_array(typecode: str, data: memoryview, offset: int, count: int) -> array:
+    values = array(typecode)
+    end = offset + count * values.itemsize
+    if end > len(data):
+        raise ValueError("Truncated wall snapshot")
+    values.frombytes(data[offset:end])
+    return _little_endian(values)
+
+
+def _little_endian(values: array) -> array:
+    """Convert an array between native and little endian byte order."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
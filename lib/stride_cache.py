@@ -0,0 +1,73 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class StrideScoreCache:
+    """Number of placeable bricks per stride window, reused across stride searches.
+
+    A stride window (x, y, width, height) only depends on the bricks in rows
+    y - 1 to y + height - 1 that overlap [x, x + width]. Changed bricks are collected
+    as dirty spans per row and only the windows overlapping them are dropped before
+    the next lookup.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    # (width, height) -> origin_y -> origin_x -> score
+    _scores: dict[tuple[int, int], dict[int, dict[int, int]]] = field(
+        default_factory=dict, repr=False
+    )
+    # row -> (left, right) span of all changed bricks in that row
+    _dirty: dict[int, tuple[int, int]] = field(default_factory=dict, repr=False)
+
+    def get(self, x: int, y: int, width: int, height: int) -> int | None:
+        if self._dirty:
+            self._invalidate_dirty()
+        score = self._scores.get((width, height), {}).get(y, {}).get(x)
+        if score is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return score
+
+    def put(self, x: int, y: int, width: int, height: int, score: int) -> None:
+        self._scores.setdefault((width, height), {}).setdefault(y, {})[x] = score
+
+    def mark_dirty(self, row: int, left: int, right: int) -> None:
+        """Record that a brick spanning [left, right] in a row has changed."""
+        if row in self._dirty:
+            (dirty_left, dirty_right) = self._dirty[row]
+            left, right = min(left, dirty_left), max(right, dirty_right)
+        self._dirty[row] = (left, right)
+
+    def forget_below(self, row: int) -> None:
+        """Drop the scores of all windows starting below a row."""
+        for rows in self._scores.values():
+            for y in [y for y in rows if y < row]:
+                del rows[y]
+        for dirty_row in [r for r in self._dirty if r < row - 1]:
+            del self._dirty[dirty_row]
+
+    def clear(self) -> None:
+        self._scores.clear()
+        self._dirty.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _invalidate_dirty(self) -> None:
+        for (width, height), rows in self._scores.items():
+            for row, (left, right) in self._dirty.items():
+                # Windows with origin_y - 1 <= row <= origin_y + height - 1
+                for y in range(row - height + 1, row + 2):
+                    origins = rows.get(y)
+                    if not origins:
+                        continue
+                    # Windows with x <= right and x + width >= left
+                    if len(origins) <= right - left + width:
+                        for x in [x for x in origins if left - width <= x <= right]:
+                            del origins[x]
+                    else:
+                        for x in range(left - width, right + 1):
+                            origins.pop(x, None)
+        self._dirty.clear()
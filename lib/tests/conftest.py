@@ -0,0 +1,16 @@
+import pytest
+
+from ..bonds import Bond
+from ..wall_state import WallState
+
+
+@pytest.fixture
+def make_wall():
+    """Factory for initialized walls, sizes are in wall units."""
+
+    def make(width=120, height=12, bond=Bond.FLEMISH, lazy=False):
+        wall = WallState()
+        wall.initialize_wall(width, height, bond, lazy=lazy)
+        return wall
+
+    return make
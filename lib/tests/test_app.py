@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+
+import pytest
+
+import app as app_module
+from app import App
+from lib.progressive import iter_bond_rows
+from lib.snapshot import load_snapshot
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = App()
+    app.snapshot_path = str(tmp_path / "wall.snapshot")
+    return app.app.test_client()
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_reset(client, lazy):
+    response = client.post(
+        "/api/init",
+        json={
+            "width": 8,
+            "height": 6,
+            "bond": "stretcher",
+            "mode": "left-to-right",
+            "lazy": lazy,
+        },
+    )
+    assert response.status_code == 200
+    for _ in range(5):
+        client.get("/api/next")
+
+    response = client.post("/api/reset")
+
+    assert response.status_code == 200
+    wall = response.get_json()
+    assert not wall["is_complete"]
+    assert len(wall["bricks"]) == 6
+    assert not any(brick["placed"] for row in wall["bricks"] for brick in row)
+
+
+def test_restore_keeps_stride_envelope(tmp_path):
+    app = App()
+    app.snapshot_path = str(tmp_path / "wall.snapshot")
+    client = app.app.test_client()
+    client.post(
+        "/api/init",
+        json={
+            "width": 12,
+            "height": 8,
+            "bond": "flemish",
+            "mode": "optimal-strides",
+            "stride_width": 500,
+            "stride_height": 400,
+        },
+    )
+    client.get("/api/next")
+    assert client.post("/api/snapshot").status_code == 200
+
+    # A restarted server continues with the stride of the snapshot
+    restarted = App()
+    restarted.snapshot_path = app.snapshot_path
+    response = restarted.app.test_client().post("/api/restore")
+
+    assert response.status_code == 200
+    assert restarted.envelope == app.envelope
+    assert (restarted.envelope.width, restarted.envelope.height) == (9, 6)
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+def test_checkpoints_wait_for_progressive_rows(client, tmp_path, monkeypatch):
+    generated = threading.Event()
+
+    def iter_rows(*args):
+        rows = iter_bond_rows(*args)
+        yield next(rows)
+        generated.wait(10)
+        yield from rows
+
+    monkeypatch.setattr(app_module, "iter_bond_rows", iter_rows)
+    response = client.post(
+        "/api/init",
+        json={
+            "width": 8,
+            "height": 6,
+            "bond": "stretcher",
+            "mode": "left-to-right",
+            "progressive": True,
+            "checkpoint_every": 1,
+        },
+    )
+    assert response.status_code == 202
+    snapshot_path = tmp_path / "wall.snapshot"
+    _wait_for(lambda: client.get("/api/next").get_json()["wall"]["bricks"])
+
+    # Only the first row is generated, a snapshot would miss the others
+    assert not os.path.exists(snapshot_path)
+
+    generated.set()
+    _wait_for(lambda: client.get("/api/next").get_json()["generation"]["done"])
+    client.get("/api/next")
+
+    (wall, _) = load_snapshot(str(snapshot_path))
+    assert wall.height == 6
+
+
+PLANNED_WALL = {
+    "width": 12,
+    "height": 8,
+    "bond": "flemish",
+    "stride_width": 500,
+    "stride_height": 200,
+}
+
+
+def _build(client) -> list[dict]:
+    """Place bricks until the wall is complete, return the stride of each step."""
+    strides = []
+    while True:
+        data = client.get("/api/next").get_json()
+        if data["wall"]["is_complete"]:
+            return strides
+        strides.append(data["stride"])
+
+
+@pytest.mark.parametrize("mode", ["parallel-strides", "travel-strides"])
+def test_time_travel_keeps_plan(client, tmp_path, mode):
+    reference = App()
+    reference.snapshot_path = str(tmp_path / "reference.snapshot")
+    reference_client = reference.app.test_client()
+    reference_client.post("/api/init", json={**PLANNED_WALL, "mode": mode})
+    expected = _build(reference_client)
+
+    client.post("/api/init", json={**PLANNED_WALL, "mode": mode})
+    for _ in range(10):
+        client.get("/api/next")
+    for _ in range(4):
+        client.post("/api/undo")
+    client.post("/api/redo")
+    client.post("/api/seek", json={"step": 3})
+
+    assert _build(client) == expected[3:]
+
+
+@pytest.mark.parametrize("mode", ["parallel-strides", "travel-strides"])
+def test_restore_plans_rest_of_wall(tmp_path, mode):
+    app = App()
+    app.snapshot_path = str(tmp_path / "wall.snapshot")
+    client = app.app.test_client()
+    client.post("/api/init", json={**PLANNED_WALL, "mode": mode})
+    for _ in range(10):
+        client.get("/api/next")
+    client.post("/api/snapshot")
+
+    assert client.post("/api/restore").status_code == 200
+    assert len(app.plan) > 0
+
+    _build(client)
+    assert app.wall.is_complete
+    assert app.plan_cursor == len(app.plan)
+
+
+def _changed(before: dict, after: dict) -> list[list[int]]:
+    return sorted(
+        [row, col]
+        for row, (old, new) in enumerate(zip(before["bricks"], after["bricks"]))
+        for col, (a, b) in enumerate(zip(old, new))
+        if a != b
+    )
+
+
+def test_steps_return_changed_bricks(client):
+    wall = client.post("/api/init", json={**PLANNED_WALL, "mode": "optimal-strides"})
+    wall = wall.get_json()
+    steps = [lambda: client.get("/api/next")] * 6 + [
+        lambda: client.post("/api/undo"),
+        lambda: client.post("/api/redo"),
+        lambda: client.post("/api/seek", json={"step": 1}),
+        lambda: client.post("/api/seek", json={"step": 5}),
+    ]
+
+    for step in steps:
+        data = step().get_json()
+        assert sorted(data["changed"]) == _changed(wall, data["wall"])
+        wall = data["wall"]
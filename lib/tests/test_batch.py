@@ -0,0 +1,120 @@
+import csv
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from .. import batch
+from ..batch import Job, main, read_jobs, run_job, run_jobs
+from ..bonds import Bond, BrickWidth
+from ..geometry import StrideEnvelope
+from ..wall_state import WallState, build_with_strides
+
+JOBS = """width,height,bond,mode,seed
+12,6,stretcher,optimal-strides,1
+9,4,flemish,left-to-right,2
+"""
+
+
+def test_read_jobs(tmp_path):
+    path = tmp_path / "jobs.csv"
+    path.write_text(JOBS)
+
+    assert read_jobs(str(path)) == [
+        Job(12, 6, "stretcher", "optimal-strides", 1),
+        Job(9, 4, "flemish", "left-to-right", 2),
+    ]
+
+
+def test_read_jobs_invalid(tmp_path):
+    path = tmp_path / "jobs.csv"
+
+    path.write_text("width,height,bond,mode,seed\n12,6,cobble,left-to-right,1\n")
+    with pytest.raises(ValueError, match="line 2"):
+        read_jobs(str(path))
+
+    path.write_text("width,height,bond,mode,seed\n12,x,english,left-to-right,1\n")
+    with pytest.raises(ValueError, match="line 2"):
+        read_jobs(str(path))
+
+    path.write_text("width,height,bond,mode,seed\n12,0,english,left-to-right,1\n")
+    with pytest.raises(ValueError, match="wall size on line 2"):
+        read_jobs(str(path))
+
+
+def test_run_job_matches_stride_build():
+    envelope = StrideEnvelope()
+    result = run_job(
+        Job(12, 6, "english", "optimal-strides", 0), envelope, include_plan=True
+    )
+
+    wall = WallState()
+    wall.initialize_wall(12 * BrickWidth.HALF, 6, Bond.ENGLISH)
+    strides = build_with_strides(wall, envelope.width, envelope.height)
+
+    assert result.strides == len(strides)
+    assert result.bricks == sum(len(row) for row in wall.bricks)
+    assert result.plan.split() == [f"{s.origin_x}:{s.origin_y}" for s in strides]
+
+
+def test_run_jobs_on_process_pool():
+    jobs = [Job(8, 4, "stretcher", "optimal-strides", seed) for seed in range(3)]
+    envelope = StrideEnvelope()
+
+    pooled = run_jobs(jobs, envelope, workers=2)
+    inline = run_jobs(jobs, envelope, workers=1)
+
+    assert [r.seed for r in pooled] == [0, 1, 2]
+    assert [r.strides for r in pooled] == [r.strides for r in inline]
+
+
+def test_failed_job_keeps_other_results(monkeypatch):
+    def build_with_strides(*_):
+        raise ValueError("No brick can be placed")
+
+    monkeypatch.setattr(batch, "build_with_strides", build_with_strides)
+    jobs = [
+        Job(8, 4, "stretcher", "optimal-strides", 0),
+        Job(8, 4, "stretcher", "left-to-right", 0),
+    ]
+
+    (failed, solved) = run_jobs(jobs, StrideEnvelope(), workers=1)
+
+    assert failed.error == "ValueError: No brick can be placed"
+    assert failed.bricks is None and failed.build_seconds is None
+    assert solved.error is None and solved.bricks > 0
+
+
+def test_cli_writes_csv(tmp_path):
+    jobs = tmp_path / "jobs.csv"
+    jobs.write_text(JOBS)
+    output = tmp_path / "results.csv"
+
+    result = CliRunner().invoke(
+        main, [str(jobs), "-o", str(output), "--workers", "1", "--plans"]
+    )
+
+    assert result.exit_code == 0, result.output
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["mode"] for row in rows] == ["optimal-strides", "left-to-right"]
+    assert int(rows[0]["strides"]) > 0
+    assert rows[0]["plan"].startswith("0:0")
+    assert rows[1]["strides"] == ""
+    assert rows[0]["error"] == rows[1]["error"] == ""
+
+
+def test_cli_writes_columns(tmp_path):
+    jobs = tmp_path / "jobs.csv"
+    jobs.write_text(JOBS)
+    output = tmp_path / "results.json"
+
+    result = CliRunner().invoke(
+        main,
+        [str(jobs), "-o", str(output), "--workers", "1", "--format", "columns"],
+    )
+
+    assert result.exit_code == 0, result.output
+    columns = json.loads(output.read_text())
+    assert columns["bond"] == ["stretcher", "flemish"]
+    assert columns["plan"] == [None, None]
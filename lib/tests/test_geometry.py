@@ -0,0 +1,71 @@
+import pytest
+
+from ..bonds import Bond, BrickWidth
+from ..geometry import StrideEnvelope
+from ..wall_state import WallState
+
+
+def test_stride_envelope_defaults():
+    envelope = StrideEnvelope()
+
+    # 800mm stride over 220mm bricks, 1300mm stride over 65.5mm courses
+    assert envelope.width == 14
+    assert envelope.height == 19
+
+
+def test_stride_envelope_custom_dimensions():
+    envelope = StrideEnvelope(stride_width=1100, stride_height=655)
+
+    assert envelope.width == 5 * BrickWidth.FULL
+    assert envelope.height == 10
+
+
+def test_stride_envelope_invalid_dimensions():
+    with pytest.raises(ValueError):
+        StrideEnvelope(stride_width=0)
+
+    with pytest.raises(ValueError):
+        StrideEnvelope(course_height=-1)
+
+    # Stride narrower than a full brick can never place a stretcher
+    with pytest.raises(ValueError):
+        StrideEnvelope(stride_width=200)
+
+
+def test_bricks_at_position():
+    wall = WallState()
+    wall.initialize_wall(6 * BrickWidth.HALF, 2, Bond.STRETCHER)
+    geometry = wall.geometry
+
+    # Even row: three full bricks
+    assert geometry.bricks_at_position(0, 0) == (0,)
+    assert geometry.bricks_at_position(0, BrickWidth.HALF) == (0,)
+    assert geometry.bricks_at_position(0, BrickWidth.FULL) == (0, 1)
+    assert geometry.bricks_at_position(0, 3 * BrickWidth.FULL) == (2,)
+
+    # Out of bounds
+    assert geometry.bricks_at_position(0, -1) == ()
+    assert geometry.bricks_at_position(0, 3 * BrickWidth.FULL + 1) == ()
+
+    # Odd row: half brick at the left edge
+    assert geometry.bricks_at_position(1, BrickWidth.HALF) == (0, 1)
+
+
+def test_columns_in_window():
+    wall = WallState()
+    wall.initialize_wall(6 * BrickWidth.HALF, 2, Bond.STRETCHER)
+
+    assert wall.geometry.columns_in_window(0, 0, 8) == range(0, 2)
+    assert wall.geometry.columns_in_window(0, 1, 8) == range(1, 2)
+    assert wall.geometry.columns_in_window(1, 2, 8) == range(1, 3)
+    assert len(wall.geometry.columns_in_window(0, 1, 4)) == 0
+    assert len(wall.geometry.columns_in_window(0, 12, 8)) == 0
+
+
+def test_geometry_is_rebuilt_on_initialize():
+    wall = WallState()
+    wall.initialize_wall(4 * BrickWidth.HALF, 1, Bond.STRETCHER)
+    assert wall.geometry.row_edges(0) == [0, 4, 8]
+
+    wall.initialize_wall(6 * BrickWidth.HALF, 1, Bond.STRETCHER)
+    assert wall.geometry.row_edges(0) == [0, 4, 8, 12]
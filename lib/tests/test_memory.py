@@ -0,0 +1,148 @@
+"""Memory budgets for large walls, measured with tracemalloc.
+
+Budgets are bytes per brick. Each test measures a small and a large wall and checks
+the growth between them, so the fixed allowance of the large wall can not hide a
+regression. Set MEMORY_BUDGET_SCALE to loosen or tighten all of them, e.g. on other
+interpreters.
+"""
+
+import gc
+import json
+import os
+import tracemalloc
+from dataclasses import dataclass
+
+import pytest
+
+from ..bonds import Bond, BrickWidth
+from ..wall_state import WallState, build_with_strides
+
+SCALE = float(os.environ.get("MEMORY_BUDGET_SCALE", "1"))
+BASE_BYTES = 64 * 1024
+
+# (peak, retained) bytes per brick
+BUDGETS = {
+    "initialize_wall": (160, 160),
+    # Placement log, stride numbers and cached stride scores
+    "build_with_strides": (200, 200),
+    # Placement log and the strides of compacted rows, not the rows themselves
+    "build_with_strides_lazy": (72, 40),
+    # Response dicts are dropped, only the JSON string is kept
+    "to_dict": (900, 100),
+}
+
+# (small, large) walls as (width in half bricks, height)
+SIZES = [((40, 20), (120, 40)), ((20, 10), (80, 30))]
+
+
+@dataclass
+class Usage:
+    peak: int
+    retained: int
+    top_lines: str
+
+
+def _measure(fn):
+    """Run fn under tracemalloc, return its result and the memory it used."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        (base, _) = tracemalloc.get_traced_memory()
+        result = fn()
+        (current, peak) = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    stats = after.compare_to(before, "lineno")[:10]
+    top_lines = "\n".join(str(stat) for stat in stats)
+    return result, Usage(peak - base, current - base, top_lines)
+
+
+def _check_budget(
+    name: str, small: tuple[Usage, int], large: tuple[Usage, int]
+) -> None:
+    """Check the bytes per brick between a small and a large wall, and the large wall
+    against the fixed allowance plus its bricks."""
+    (peak_per_brick, retained_per_brick) = BUDGETS[name]
+    ((small_usage, small_bricks), (usage, bricks)) = (small, large)
+    added_bricks = bricks - small_bricks
+    peak_growth = (usage.peak - small_usage.peak) / added_bricks
+    retained_growth = (usage.retained - small_usage.retained) / added_bricks
+    peak_budget = (BASE_BYTES + peak_per_brick * bricks) * SCALE
+    retained_budget = (BASE_BYTES + retained_per_brick * bricks) * SCALE
+    report = (
+        f"{name} with {small_bricks} and {bricks} bricks: "
+        f"peak {small_usage.peak} B and {usage.peak} B ({peak_growth:.0f} B/brick, "
+        f"budget {peak_per_brick * SCALE:.0f} B/brick), "
+        f"retained {small_usage.retained} B and {usage.retained} B "
+        f"({retained_growth:.0f} B/brick, "
+        f"budget {retained_per_brick * SCALE:.0f} B/brick)\n"
+        f"Top allocating lines of the large wall:\n{usage.top_lines}"
+    )
+    assert peak_growth <= peak_per_brick * SCALE, report
+    assert retained_growth <= retained_per_brick * SCALE, report
+    assert usage.peak <= peak_budget, report
+    assert usage.retained <= retained_budget, report
+
+
+def _initialize(width: int, height: int, bond: Bond) -> WallState:
+    wall = WallState()
+    wall.initialize_wall(width * BrickWidth.HALF, height, bond)
+    return wall
+
+
+def _count_bricks(wall: WallState) -> int:
+    return sum(len(row) for row in wall.bricks)
+
+
+@pytest.mark.parametrize("bond", [Bond.STRETCHER, Bond.FLEMISH, Bond.ENGLISH])
+@pytest.mark.parametrize("sizes", SIZES)
+def test_initialize_wall_memory(sizes, bond):
+    measured = []
+    for width, height in sizes:
+        (wall, usage) = _measure(lambda: _initialize(width, height, bond))
+        measured.append((usage, _count_bricks(wall)))
+
+    _check_budget("initialize_wall", *measured)
+
+
+# Building is slow under tracemalloc, so only smaller walls are built
+@pytest.mark.parametrize("bond", [Bond.STRETCHER, Bond.FLEMISH])
+def test_build_with_strides_memory(bond):
+    measured = []
+    for width, height in [(30, 12), (60, 24)]:
+        wall = _initialize(width, height, bond)
+        (_, usage) = _measure(lambda: build_with_strides(wall, 14, 19))
+        assert wall.is_complete
+        measured.append((usage, _count_bricks(wall)))
+
+    _check_budget("build_with_strides", *measured)
+
+
+def test_lazy_build_memory_follows_active_band():
+    measured = []
+    for height in [100, 300]:
+        wall = WallState()
+        wall.initialize_wall(12 * BrickWidth.HALF, height, Bond.ENGLISH, lazy=True)
+        (_, usage) = _measure(
+            lambda: len(build_with_strides(wall, 2 * BrickWidth.FULL, 3))
+        )
+        assert wall.is_complete
+        assert wall.bricks.materialized_rows <= 2 * 3 + 2
+        measured.append((usage, _count_bricks(wall)))
+
+    _check_budget("build_with_strides_lazy", *measured)
+
+
+@pytest.mark.parametrize("sizes", SIZES)
+def test_serialization_memory(sizes):
+    measured = []
+    for width, height in sizes:
+        wall = _initialize(width, height, Bond.FLEMISH)
+        list(wall.place_bricks_left_to_right())
+        (_, usage) = _measure(lambda: json.dumps(wall.to_dict()))
+        measured.append((usage, _count_bricks(wall)))
+
+    _check_budget("to_dict", *measured)
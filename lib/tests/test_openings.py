@@ -0,0 +1,141 @@
+import pytest
+
+from ..bonds import Bond, Brick, BrickWidth
+from ..openings import Opening, OpeningIndex, cut_row
+from ..snapshot import load_snapshot, save_snapshot
+from ..wall_state import WallState, build_with_strides
+
+# pylint: disable=protected-access
+
+
+def test_opening_index_lookups():
+    index = OpeningIndex([Opening(4, 1, 8, 2), Opening(16, 0, 4, 3, lintel=False)])
+
+    assert index.spans(0) == [(16, 20)]
+    assert index.spans(1) == [(4, 12), (16, 20)]
+    assert index.spans(3) == []
+
+    # Lintel on top of row 2 supports the opening including its edges
+    assert index.lintel_supports(2, 8) is True
+    assert index.lintel_supports(2, 4) is True
+    assert index.lintel_supports(2, 12) is True
+    assert index.lintel_supports(2, 3) is False
+    assert index.lintel_supports(2, 13) is False
+    assert index.lintel_supports(1, 8) is False
+    assert index.lintel_supports(2, 18) is False
+
+
+def test_opening_index_rejects_invalid_openings():
+    with pytest.raises(ValueError):
+        OpeningIndex([Opening(0, 0, 8, 2), Opening(4, 1, 8, 2)])
+
+    with pytest.raises(ValueError):
+        OpeningIndex([Opening(0, 0, 0, 2)])
+
+    with pytest.raises(ValueError):
+        OpeningIndex([Opening(0, 0, 8, 2)]).validate(width=4, height=4)
+
+    # Bricks above an opening without lintel could never be placed
+    with pytest.raises(ValueError):
+        OpeningIndex([Opening(0, 0, 4, 2, lintel=False)]).validate(width=8, height=4)
+
+    # A wall with an empty top row would be complete without placing anything
+    with pytest.raises(ValueError):
+        OpeningIndex([Opening(0, 2, 8, 2, lintel=False)]).validate(width=8, height=4)
+    with pytest.raises(ValueError):
+        OpeningIndex([Opening(0, 1, 4, 1), Opening(4, 1, 4, 1)]).validate(
+            width=8, height=4
+        )
+
+
+def test_cut_row():
+    bricks = [Brick(), Brick(), Brick()]
+
+    cut = cut_row(bricks, [(2, 7)])
+
+    assert [(brick.width, brick.opening) for brick in cut] == [
+        (BrickWidth.HALF, False),
+        (BrickWidth.HALF, True),
+        (BrickWidth.HALF, True),
+        (BrickWidth.QUARTER, True),
+        (BrickWidth.QUARTER, False),
+        (BrickWidth.FULL, False),
+    ]
+    assert cut[-1] is bricks[-1]
+
+
+def test_wall_with_opening():
+    wall = WallState()
+    wall.initialize_wall(
+        8 * BrickWidth.HALF, 4, Bond.STRETCHER, openings=[Opening(4, 1, 8, 2)]
+    )
+
+    # Row 1 starts with a half brick, bricks at [2, 6] and [10, 14] are cut in half
+    assert [brick.opening for brick in wall.bricks[1]] == [
+        False,
+        False,
+        True,
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert wall.width == 4 * BrickWidth.FULL
+
+    # Openings can never be placed
+    for brick in wall.bricks[0]:
+        brick.placed = True
+    assert wall._can_place_brick(1, 2) is False
+
+    # Bricks above the opening rest on the lintel and the jambs
+    for row in (1, 2):
+        for brick in wall.bricks[row]:
+            brick.placed = not brick.opening
+    assert wall._can_place_brick(3, 1) is True
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_build_wall_with_openings(lazy):
+    wall = WallState()
+    wall.initialize_wall(
+        20 * BrickWidth.HALF,
+        10,
+        Bond.FLEMISH,
+        lazy=lazy,
+        openings=[Opening(6, 2, 10, 4), Opening(26, 0, 6, 7), Opening(2, 8, 4, 2)],
+    )
+
+    build_with_strides(wall, 2 * BrickWidth.FULL, 3)
+
+    assert wall.is_complete
+    assert all(brick.placed != brick.opening for row in wall.bricks for brick in row)
+
+
+@pytest.mark.parametrize("x", [0, 32])
+def test_build_wall_with_opening_at_wall_edge(x):
+    # No brick next to the opening supports the bricks above its outer edge
+    wall = WallState()
+    wall.initialize_wall(
+        20 * BrickWidth.HALF, 8, Bond.STRETCHER, openings=[Opening(x, 2, 8, 3)]
+    )
+
+    build_with_strides(wall, 2 * BrickWidth.FULL, 3)
+
+    assert wall.is_complete
+    assert all(brick.placed != brick.opening for row in wall.bricks for brick in row)
+
+
+def test_snapshot_keeps_openings(tmp_path):
+    wall = WallState()
+    wall.initialize_wall(
+        8 * BrickWidth.HALF, 4, Bond.STRETCHER, openings=[Opening(4, 1, 8, 2)]
+    )
+    path = tmp_path / "wall.snapshot"
+    save_snapshot(wall, str(path))
+
+    (restored, _) = load_snapshot(str(path))
+
+    assert list(restored.bricks) == wall.bricks
+    assert restored.openings.openings == wall.openings.openings
+    build_with_strides(restored, 2 * BrickWidth.FULL, 2)
+    assert restored.is_complete
@@ -0,0 +1,100 @@
+import pytest
+
+from ..bonds import Bond, BrickWidth
+from ..placement_log import Placement, PlacementLog
+from ..wall_state import Stride, WallState, build_with_strides
+
+
+def _placed(wall: WallState) -> list[list[int | None]]:
+    return [
+        [brick.stride if brick.placed else 0 for brick in row] for row in wall.bricks
+    ]
+
+
+def test_record_undo_redo():
+    log = PlacementLog()
+    log.record(0, 0, 1)
+    log.record(0, 1, 1)
+
+    assert log.undo() == Placement(0, 1, 1, 1)
+    assert log.position == 1
+    assert log.redo() == Placement(0, 1, 1, 1)
+    assert log.redo() is None
+
+    # Recording after an undo drops the undone placements
+    log.undo()
+    assert log.record(1, 0, 2) == Placement(1, 0, 2, 1)
+    assert len(log.entries) == 2
+    assert not log.can_redo
+
+
+def test_wall_records_placements():
+    wall = WallState()
+    wall.initialize_wall(4 * BrickWidth.HALF, 2, Bond.STRETCHER)
+    list(wall.place_bricks_for_stride(Stride(0, 0, 2 * BrickWidth.FULL, 2)))
+
+    assert [(p.row, p.col, p.stride) for p in wall.history.entries] == [
+        (0, 0, 1),
+        (0, 1, 1),
+        (1, 0, 1),
+        (1, 1, 1),
+        (1, 2, 1),
+    ]
+
+
+def test_undo_and_redo_restore_wall():
+    wall = WallState()
+    wall.initialize_wall(4 * BrickWidth.HALF, 2, Bond.STRETCHER)
+    list(wall.place_bricks_for_stride(Stride(0, 0, 2 * BrickWidth.FULL, 2)))
+    complete = _placed(wall)
+
+    assert wall.undo() is True
+    assert wall.bricks[1][2].placed is False
+    assert wall.bricks[1][2].stride is None
+
+    assert wall.redo() is True
+    assert _placed(wall) == complete
+    assert wall.redo() is False
+
+
+def test_undo_on_empty_history():
+    wall = WallState()
+    wall.initialize_wall(4 * BrickWidth.HALF, 2, Bond.STRETCHER)
+
+    assert wall.undo() is False
+
+
+def test_seek_matches_replayed_build():
+    wall = WallState()
+    wall.initialize_wall(12 * BrickWidth.HALF, 6, Bond.FLEMISH)
+    build_with_strides(wall, 2 * BrickWidth.FULL, 2)
+    total = len(wall.history.entries)
+
+    # Capture the wall after every step by undoing one placement at a time
+    states = [_placed(wall)]
+    while wall.undo():
+        states.append(_placed(wall))
+    states.reverse()
+
+    for step in (total, 3, total // 2, 0, total - 1):
+        wall.seek(step)
+        assert _placed(wall) == states[step]
+
+    with pytest.raises(ValueError):
+        wall.seek(total + 1)
+
+
+def test_new_stride_after_undo_continues_numbering():
+    wall = WallState()
+    wall.initialize_wall(8 * BrickWidth.HALF, 2, Bond.STRETCHER)
+    list(wall.place_bricks_for_stride(Stride(0, 0, 2 * BrickWidth.FULL, 2)))
+    list(wall.place_bricks_for_stride(Stride(8, 0, 2 * BrickWidth.FULL, 2)))
+
+    # Revert all placements of the second stride
+    while wall.history.entries[wall.history.position - 1].stride == 2:
+        wall.undo()
+    assert wall.current_stride == 1
+
+    placed = list(wall.place_bricks_for_stride(Stride(8, 0, 2 * BrickWidth.FULL, 2)))
+    assert {brick.stride for brick in placed} == {2}
+    assert not wall.history.can_redo
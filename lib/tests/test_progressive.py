@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from ..bonds import Bond, initialize_wild_bond
+from ..openings import Opening, OpeningIndex
+from ..progressive import ProgressiveWall, iter_bond_rows
+from ..wall_state import WallState, build_with_strides
+
+
+def _widths(rows):
+    return [[brick.width for brick in bricks] for bricks in rows]
+
+
+def test_iter_bond_rows_matches_initialized_wall():
+    openings = [Opening(x=4, y=1, width=8, height=2)]
+    wall = WallState()
+    wall.initialize_wall(40, 6, Bond.FLEMISH, openings=openings)
+
+    rows = list(iter_bond_rows(40, 6, Bond.FLEMISH, OpeningIndex(openings)))
+
+    assert _widths(bricks for bricks, _ in rows) == _widths(wall.bricks)
+    assert [violations for _, violations in rows] == [None] * 6
+
+
+def test_iter_bond_rows_reports_wild_bond_violations():
+    random.seed(3)
+    expected = initialize_wild_bond(24, 8, max_attempts=1000)
+    random.seed(3)
+    rows = list(iter_bond_rows(24, 8, Bond.WILD))
+
+    assert _widths(bricks for bricks, _ in rows) == _widths(expected)
+    assert all(isinstance(violations, int) for _, violations in rows)
+
+
+def test_progressive_wall_streams_and_syncs_rows():
+    progressive = ProgressiveWall(5, iter_bond_rows(24, 5, Bond.ENGLISH)).start()
+    events = list(progressive.events())
+
+    assert [event["row"] for event in events[:-1]] == [0, 1, 2, 3, 4]
+    assert events[-2]["progress"] == 1.0
+    assert events[-1]["done"] and events[-1]["rows"] == 5
+
+    wall = WallState()
+    wall.initialize_wall(24, 5, Bond.ENGLISH, progressive=True)
+    assert progressive.sync(wall) == 5
+    assert progressive.sync(wall) == 0
+    build_with_strides(wall, 14, 3)
+
+    # placing bricks does not change the generated rows
+    assert wall.is_complete
+    assert not any(brick.placed for bricks in progressive.rows for brick in bricks)
+
+
+def test_progressive_wall_is_incomplete_until_all_rows_are_added():
+    rows = iter_bond_rows(24, 3, Bond.STRETCHER)
+    wall = WallState()
+    wall.initialize_wall(24, 3, Bond.STRETCHER, progressive=True)
+
+    wall.append_row(next(rows)[0])
+    list(wall.place_bricks_left_to_right())
+    assert not wall.is_complete
+
+    for bricks, _ in rows:
+        wall.append_row(bricks)
+    list(wall.place_bricks_left_to_right())
+    assert wall.is_complete
+
+    with pytest.raises(ValueError):
+        wall.append_row([])
+
+
+def test_progressive_wall_reports_errors():
+    def rows():
+        yield from iter_bond_rows(24, 1, Bond.STRETCHER)
+        raise RuntimeError("generator failed")
+
+    progressive = ProgressiveWall(2, rows()).start()
+    summary = list(progressive.events())[-1]
+
+    assert summary["done"] and summary["rows"] == 1
+    assert summary["error"] == "generator failed"
@@ -0,0 +1,84 @@
+from random import seed
+
+import pytest
+
+from ..bonds import Bond, BrickWidth
+from ..rows import BondRowProvider, LazyRows
+from ..wall_state import WallState, build_with_strides
+
+
+def test_provider_repeats_templates():
+    provider = BondRowProvider(8 * BrickWidth.HALF, 5, Bond.STRETCHER)
+
+    assert provider.widths(0) == bytes([BrickWidth.FULL] * 4)
+    assert provider.widths(1) == bytes(
+        [BrickWidth.HALF, BrickWidth.FULL, BrickWidth.FULL, BrickWidth.FULL]
+        + [BrickWidth.HALF]
+    )
+    assert provider.widths(4) == provider.widths(0)
+
+    with pytest.raises(IndexError):
+        provider.widths(5)
+
+
+def test_rows_are_materialized_on_access():
+    rows = LazyRows(BondRowProvider(8 * BrickWidth.HALF, 100, Bond.FLEMISH))
+
+    assert len(rows) == 100
+    assert rows.materialized_rows == 0
+
+    rows[50][0].placed = True
+    assert rows.materialized_rows == 1
+    assert rows[50][0].placed is True
+    assert rows[-50] is rows[50]
+
+    # Iterating does not materialize rows
+    assert sum(len(row) for row in rows) > 0
+    assert rows.materialized_rows == 1
+
+
+def test_compact_below_keeps_placements():
+    rows = LazyRows(BondRowProvider(4 * BrickWidth.HALF, 3, Bond.STRETCHER))
+    for brick in rows[0]:
+        brick.placed = True
+        brick.stride = 7
+    rows[1][0].placed = True
+
+    assert rows.compact_below(2) == [0]
+    assert rows.materialized_rows == 1
+    assert rows.width == 4 * BrickWidth.HALF
+    assert rows.materialized_rows == 1
+    assert rows.is_row_complete(0)
+    assert not rows.is_row_complete(1)
+    assert not rows.is_row_complete(2)
+
+    # Compacted rows come back with their strides
+    assert [(brick.placed, brick.stride) for brick in rows[0]] == [(True, 7)] * 2
+
+
+@pytest.mark.parametrize("bond", list(Bond))
+def test_lazy_wall_matches_eager_wall(bond):
+    seed(3)
+    eager = WallState()
+    eager.initialize_wall(20 * BrickWidth.HALF, 12, bond)
+    eager_strides = build_with_strides(eager, 2 * BrickWidth.FULL, 3)
+
+    seed(3)
+    lazy = WallState()
+    lazy.initialize_wall(20 * BrickWidth.HALF, 12, bond, lazy=True)
+    lazy_strides = build_with_strides(lazy, 2 * BrickWidth.FULL, 3)
+
+    assert lazy_strides == eager_strides
+    assert lazy.to_dict() == eager.to_dict()
+    assert lazy.width == eager.width
+
+
+def test_lazy_wall_reset():
+    wall = WallState()
+    wall.initialize_wall(4 * BrickWidth.HALF, 4, Bond.STRETCHER, lazy=True)
+    list(wall.place_bricks_left_to_right())
+    assert wall.is_complete
+
+    wall.reset()
+    assert wall.first_incomplete_row() == 0
+    assert not any(brick.placed for row in wall.bricks for brick in row)
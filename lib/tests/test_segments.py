@@ -0,0 +1,93 @@
+import pickle
+from copy import deepcopy
+
+import pytest
+
+from ..bonds import Bond, BrickWidth
+from ..openings import Opening
+from ..segments import SegmentRows, plan_in_segments, plan_segment
+from ..wall_state import Stride, WallState, build_with_strides
+
+
+def test_plan_segment_stays_inside_window(make_wall):
+    wall = make_wall()
+    window = (14, 42)
+
+    strides = plan_segment(wall, window, 14, 6)
+
+    assert strides
+    assert all(14 <= s.origin_x and s.origin_x + 14 <= 42 for s in strides)
+    for row in wall.bricks:
+        left_edge = 0
+        for brick in row:
+            if brick.placed:
+                assert window[0] <= left_edge and left_edge + brick.width <= window[1]
+            left_edge += brick.width
+
+
+@pytest.mark.parametrize("bottom", [0, 4])
+@pytest.mark.parametrize("window", [(0, 28), (14, 42), (31, 59), (98, 126)])
+def test_cropped_rows_plan_like_the_whole_wall(window, bottom):
+    wall = WallState()
+    wall.initialize_wall(
+        60 * BrickWidth.HALF,
+        12,
+        Bond.FLEMISH,
+        openings=[Opening(36, 2, 12, 3), Opening(100, 8, 8, 4, lintel=False)],
+    )
+    list(wall.place_bricks_for_stride(Stride(20, 0, 14, 6)))
+    band = (bottom, bottom + 6)
+
+    rows = SegmentRows.crop(wall, window, range(max(bottom - 1, 0), 12))
+
+    assert rows.plan(window, band, 14, 6) == plan_segment(wall, window, 14, 6, band)
+    assert len(pickle.dumps(rows)) < len(pickle.dumps(wall)) / 4
+    # fillers are valid bricks, so cropped walls can be serialized
+    assert rows.to_wall().to_dict()
+
+
+@pytest.mark.parametrize("segments", [1, 3, 4])
+def test_plan_in_segments_completes_wall(make_wall, segments):
+    wall = make_wall()
+    original = deepcopy(wall)
+
+    plan = plan_in_segments(wall, 14, 6, segments=segments, workers=2, compare=True)
+
+    # the wall itself is not modified
+    assert wall.to_dict() == original.to_dict()
+
+    replayed = deepcopy(wall)
+    counts = [len(list(replayed.place_bricks_for_stride(s))) for s in plan.strides]
+    assert counts == plan.bricks_per_stride
+    assert all(counts)
+    assert replayed.is_complete
+
+    # segments are rounded up to whole strides, so there may be fewer of them
+    assert 1 <= len(plan.segment_strides) <= segments
+    assert sum(plan.segment_strides) + plan.seam_strides == len(plan.strides)
+    assert plan.greedy_strides == len(build_with_strides(deepcopy(wall), 14, 6))
+
+
+def test_single_segment_matches_greedy(make_wall):
+    wall = make_wall(bond=Bond.ENGLISH)
+
+    plan = plan_in_segments(wall, 14, 6, segments=1, workers=1, compare=True)
+
+    assert plan.seam_strides == 0
+    assert len(plan.strides) == plan.greedy_strides
+
+
+def test_tall_walls_are_planned_in_segments():
+    wall = WallState()
+    wall.initialize_wall(120 * BrickWidth.HALF, 60, Bond.STRETCHER)
+
+    plan = plan_in_segments(wall, 14, 6, segments=4, workers=2)
+
+    # seams are reconciled per band, so the segments keep planning up the wall
+    assert min(plan.segment_strides) > 0
+    assert sum(plan.segment_strides) > 3 * plan.seam_strides
+
+
+def test_lazy_walls_are_rejected(make_wall):
+    with pytest.raises(ValueError):
+        plan_in_segments(make_wall(lazy=True), 14, 6)
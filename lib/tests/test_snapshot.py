@@ -0,0 +1,100 @@
+import pytest
+
+from ..bonds import Bond, BrickWidth
+from ..geometry import StrideEnvelope
+from ..openings import Opening, OpeningIndex
+from ..snapshot import load_snapshot, save_snapshot
+from ..wall_state import Stride, WallState, find_best_stride
+
+
+def test_snapshot_roundtrip(tmp_path):
+    wall = WallState()
+    wall.initialize_wall(9 * BrickWidth.HALF, 4, Bond.FLEMISH)
+    list(wall.place_bricks_for_stride(Stride(0, 0, 2 * BrickWidth.FULL, 2)))
+
+    path = tmp_path / "wall.snapshot"
+    save_snapshot(wall, str(path))
+    (restored, _) = load_snapshot(str(path))
+
+    assert list(restored.bricks) == wall.bricks
+    assert restored.current_stride == wall.current_stride
+    assert restored.to_dict() == wall.to_dict()
+
+
+def test_snapshot_keeps_stride_envelope(tmp_path):
+    wall = WallState()
+    wall.initialize_wall(8 * BrickWidth.HALF, 3, Bond.STRETCHER)
+    envelope = StrideEnvelope(stride_width=500, stride_height=400)
+
+    path = tmp_path / "wall.snapshot"
+    save_snapshot(wall, str(path), envelope)
+    (_, restored) = load_snapshot(str(path))
+
+    assert restored == envelope
+
+
+def test_restored_rows_are_built_on_access(tmp_path):
+    wall = WallState()
+    wall.initialize_wall(8 * BrickWidth.HALF, 6, Bond.STRETCHER)
+    list(wall.place_bricks_for_stride(Stride(0, 0, 2 * BrickWidth.FULL, 3)))
+
+    path = tmp_path / "wall.snapshot"
+    save_snapshot(wall, str(path))
+    (restored, _) = load_snapshot(str(path))
+
+    assert restored.bricks.materialized_rows == 0
+    assert restored.first_incomplete_row() == wall.first_incomplete_row()
+    assert restored.width == wall.width
+    assert restored.bricks.materialized_rows == 0
+
+    restored.reset()
+    assert not any(brick.placed for row in restored.bricks for brick in row)
+    assert restored.first_incomplete_row() == 0
+
+
+def test_restored_wall_continues_planning(tmp_path):
+    wall = WallState()
+    wall.initialize_wall(8 * BrickWidth.HALF, 3, Bond.STRETCHER)
+    list(wall.place_bricks_for_stride(Stride(0, 0, 2 * BrickWidth.FULL, 2)))
+
+    path = tmp_path / "wall.snapshot"
+    save_snapshot(wall, str(path))
+    (restored, _) = load_snapshot(str(path))
+
+    # Derived geometry is rebuilt on the restored wall
+    assert find_best_stride(restored, 2 * BrickWidth.FULL, 2) == find_best_stride(
+        wall, 2 * BrickWidth.FULL, 2
+    )
+
+
+def test_load_invalid_snapshot(tmp_path):
+    path = tmp_path / "wall.snapshot"
+    path.write_bytes(b"not a wall")
+
+    with pytest.raises(ValueError):
+        load_snapshot(str(path))
+
+
+def test_load_truncated_snapshot(tmp_path):
+    wall = WallState()
+    wall.initialize_wall(4 * BrickWidth.HALF, 2, Bond.STRETCHER)
+
+    path = tmp_path / "wall.snapshot"
+    save_snapshot(wall, str(path))
+    path.write_bytes(path.read_bytes()[:-1])
+
+    with pytest.raises(ValueError):
+        load_snapshot(str(path))
+
+
+def test_load_snapshot_with_invalid_opening(tmp_path):
+    wall = WallState()
+    wall.initialize_wall(4 * BrickWidth.HALF, 2, Bond.STRETCHER)
+    # Corrupt opening outside of the wall
+    wall.openings = OpeningIndex([Opening(12, 0, 4, 1)])
+
+    path = tmp_path / "wall.snapshot"
+    save_snapshot(wall, str(path))
+
+    with pytest.raises(ValueError, match="Invalid opening"):
+        load_snapshot(str(path))
@@ -0,0 +1,80 @@
+from random import seed
+
+import pytest
+
+from ..bonds import Bond, BrickWidth
+from ..stride_cache import StrideScoreCache
+from ..wall_state import Stride, WallState, find_best_stride
+
+
+def test_cache_hits_and_misses():
+    cache = StrideScoreCache()
+
+    assert cache.get(0, 0, 8, 2) is None
+    cache.put(0, 0, 8, 2, 5)
+    assert cache.get(0, 0, 8, 2) == 5
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_dirty_brick_invalidates_overlapping_windows():
+    cache = StrideScoreCache()
+    for y in range(4):
+        for x in range(20):
+            cache.put(x, y, 8, 2, 1)
+
+    # Brick spanning [10, 14] in row 2
+    cache.mark_dirty(2, 10, 14)
+
+    # Windows overlapping the brick horizontally, with row 2 inside the window
+    # or directly below it, are dropped
+    for y in range(4):
+        for x in range(20):
+            overlaps = 10 <= x + 8 and x <= 14 and y - 1 <= 2 <= y + 1
+            assert (cache.get(x, y, 8, 2) is None) == overlaps, (x, y)
+
+
+def test_forget_below():
+    cache = StrideScoreCache()
+    for y in range(4):
+        cache.put(0, y, 8, 2, 1)
+
+    cache.forget_below(2)
+
+    assert [cache.get(0, y, 8, 2) for y in range(4)] == [None, None, 1, 1]
+
+
+@pytest.mark.parametrize("bond", list(Bond))
+def test_cached_strides_are_identical(bond):
+    seed(5)
+    wall = WallState()
+    wall.initialize_wall(24 * BrickWidth.HALF, 10, bond)
+    stride = Stride(0, 0, 2 * BrickWidth.FULL + BrickWidth.HALF, 3)
+
+    while True:
+        list(wall.place_bricks_for_stride(stride))
+        if wall.is_complete:
+            break
+        stride = find_best_stride(wall, stride.width, stride.height)
+
+        # A search without cached scores must choose the same stride
+        cached_scores = wall.stride_scores
+        wall.stride_scores = StrideScoreCache()
+        assert find_best_stride(wall, stride.width, stride.height) == stride
+        wall.stride_scores = cached_scores
+
+    assert wall.stride_scores.hits > 0
+
+
+def test_undo_invalidates_cached_scores():
+    wall = WallState()
+    wall.initialize_wall(8 * BrickWidth.HALF, 3, Bond.STRETCHER)
+    list(wall.place_bricks_for_stride(Stride(0, 0, 2 * BrickWidth.FULL, 2)))
+    before = find_best_stride(wall, 2 * BrickWidth.FULL, 2)
+
+    wall.seek(0)
+    assert find_best_stride(wall, 2 * BrickWidth.FULL, 2) == Stride(
+        0, 0, 2 * BrickWidth.FULL, 2
+    )
+
+    wall.seek(len(wall.history.entries))
+    assert find_best_stride(wall, 2 * BrickWidth.FULL, 2) == before
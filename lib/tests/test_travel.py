@@ -0,0 +1,101 @@
+from copy import deepcopy
+
+import pytest
+
+from ..travel import (
+    BuildCostModel,
+    improve_order,
+    plan_heuristic,
+    plan_travel_aware,
+    stride_dependencies,
+)
+from ..wall_state import Stride
+
+
+def test_cost_model_estimate():
+    model = BuildCostModel(
+        move_seconds=1, lift_seconds=10, brick_seconds=2, stride_seconds=5
+    )
+    strides = [Stride(4, 0, 14, 6), Stride(10, 3, 14, 6)]
+
+    # 4 to the right, then 6 to the right and 3 up
+    assert model.estimate(strides, [3, 1]) == (4 + 5 + 3 * 2) + (6 + 30 + 5 + 1 * 2)
+
+
+def test_cost_model_rejects_negative_costs():
+    with pytest.raises(ValueError, match="lift_seconds"):
+        BuildCostModel(lift_seconds=-1)
+
+
+def test_improve_order_respects_dependencies():
+    model = BuildCostModel(move_seconds=1, lift_seconds=1)
+    strides = [Stride(0, 0, 4, 2), Stride(20, 0, 4, 2), Stride(0, 2, 4, 2)]
+
+    # without dependencies the far stride moves to the end
+    (order, moves) = improve_order(strides, [set(), set(), set()], model)
+    assert order == [strides[0], strides[2], strides[1]]
+    assert moves == 1
+
+    # the far stride must come before the last one
+    (order, moves) = improve_order(strides, [set(), set(), {1}], model)
+    assert order == strides
+    assert moves == 0
+
+
+def test_dependencies_point_to_earlier_strides(make_wall):
+    wall = make_wall(width=80)
+    strides = plan_heuristic(wall, 14, 6, BuildCostModel())
+
+    dependencies = stride_dependencies(wall, 0)
+
+    assert len(dependencies) == len(strides)
+    assert dependencies[0] == set()
+    assert all(d < stride for stride, ds in enumerate(dependencies) for d in ds)
+
+
+def test_heuristic_only_scores_nearby_strides(make_wall):
+    wall = make_wall(width=400)
+
+    strides = plan_heuristic(wall, 14, 6, BuildCostModel())
+
+    # Strides next to the previous one in two rows and around the frontier
+    stats = wall.stride_scores.stats()
+    assert (stats["hits"] + stats["misses"]) / len(strides) <= 3 * (2 * 14 + 1)
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        BuildCostModel(),
+        BuildCostModel(move_seconds=3, lift_seconds=10, stride_seconds=60),
+    ],
+)
+def test_plan_travel_aware_completes_wall(make_wall, model):
+    wall = make_wall(width=80)
+    original = deepcopy(wall)
+
+    plan = plan_travel_aware(wall, 14, 6, model, compare=True)
+
+    # the wall itself is not modified
+    assert wall.to_dict() == original.to_dict()
+
+    replayed = deepcopy(wall)
+    counts = [len(list(replayed.place_bricks_for_stride(s))) for s in plan.strides]
+    assert counts == plan.bricks_per_stride
+    assert all(counts)
+    assert replayed.is_complete
+
+    assert plan.seconds == model.estimate(plan.strides, plan.bricks_per_stride)
+    assert plan.seconds <= plan.heuristic_seconds
+    assert plan.greedy_strides > 0 and plan.greedy_seconds > 0
+
+
+def test_greedy_comparison_is_optional(make_wall):
+    plan = plan_travel_aware(make_wall(width=80), 14, 6)
+
+    assert plan.greedy_strides is None and plan.greedy_seconds is None
+
+
+def test_lazy_walls_are_rejected(make_wall):
+    with pytest.raises(ValueError):
+        plan_travel_aware(make_wall(lazy=True), 14, 6)
@@ -138,23 +138,18 @@ def test_can_place_brick():
     assert wall._can_place_brick(1, 3) is True
 
 
-def test_is_brick_in_stride_window():
-    # pylint: disable=protected-access
+def test_bricks_in_stride_window():
     wall = WallState()
     wall.initialize_wall(6 * BrickWidth.HALF, 3, Bond.STRETCHER)
-
-    # Test case first row, first full brick is not fully inside stride window
     stride = Stride(0, 0, 2 * BrickWidth.FULL, 2)
-    assert wall._is_brick_in_stride_window(0, 0, stride) is True
-    assert wall._is_brick_in_stride_window(0, 1, stride) is True
-    assert wall._is_brick_in_stride_window(0, 2, stride) is False
+    window = (stride.origin_x, stride.width)
+
+    # Test case first row, the third full brick is not inside the stride window
+    assert list(wall.geometry.columns_in_window(0, *window)) == [0, 1]
 
-    # Test case second row, first half brick and full brick are not fully inside
-    # stride window
-    assert wall._is_brick_in_stride_window(1, 0, stride) is True
-    assert wall._is_brick_in_stride_window(1, 1, stride) is True
-    assert wall._is_brick_in_stride_window(1, 2, stride) is False
-    assert wall._is_brick_in_stride_window(1, 3, stride) is False
+    # Test case second row, the first half brick and full brick are inside the
+    # stride window, the second full brick and last half brick are not
+    assert list(wall.geometry.columns_in_window(1, *window)) == [0, 1]
 
 
 def test_place_bricks_for_stride():
@@ -216,3 +211,18 @@ def test_find_best_stride():
     # Verify by placing bricks at the optimal position
     placed_bricks = list(wall.place_bricks_for_stride(optimal_stride))
     assert len(placed_bricks) == 3  # Should be able to place 3 bricks
+
+
+def test_find_best_stride_does_not_modify_wall():
+    wall = WallState()
+    wall.initialize_wall(6 * BrickWidth.HALF, 3, Bond.STRETCHER)
+    wall.bricks[0][0].placed = True
+
+    find_best_stride(wall, stride_width=2 * BrickWidth.FULL, stride_height=2)
+
+    assert [[brick.placed for brick in row] for row in wall.bricks] == [
+        [True, False, False],
+        [False, False, False, False],
+        [False, False, False],
+    ]
+    assert wall.current_stride == 0
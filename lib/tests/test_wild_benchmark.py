@@ -0,0 +1,100 @@
+import csv
+import random
+
+from click.testing import CliRunner
+
+from ..bonds import (
+    count_wildverband_violations,
+    initialize_stretcher_bond,
+    iter_checked_wild_bond_rows,
+)
+from ..wild_benchmark import Config, Measurement, main, measure, summarize
+
+
+def test_violations_match_generator_checks():
+    random.seed(7)
+    checked = list(iter_checked_wild_bond_rows(40, 12, max_attempts=5))
+
+    rows = [bricks for bricks, _ in checked]
+    assert count_wildverband_violations(rows) == [v for _, v in checked]
+
+
+def test_measure_is_reproducible():
+    config = Config(width=16, height=8, max_attempts=5, half_brick_probability=0.3)
+
+    first = measure(config, seed=1)
+    second = measure(config, seed=1, memory=False)
+
+    assert first.violations == second.violations
+    assert first.peak_bytes > 0
+    assert second.peak_bytes is None
+
+
+def test_measure_other_generator():
+    calls = []
+
+    def generator(width, height, max_attempts, half_brick_probability):
+        calls.append((width, height, max_attempts, half_brick_probability))
+        return initialize_stretcher_bond(width, height)
+
+    config = Config(width=16, height=8, max_attempts=3, half_brick_probability=0.5)
+    measurement = measure(config, seed=0, generator=generator)
+
+    # wall width is converted from half bricks, the traced run repeats the call
+    assert calls == [(32, 8, 3, 0.5)] * 2
+    assert measurement.violations == 0
+
+
+def _measurement(max_attempts, seconds, violations, width=10):
+    return Measurement(width, 5, max_attempts, 0.2, 0, seconds, None, violations)
+
+
+def test_summarize_marks_pareto_front():
+    summaries = summarize(
+        [
+            _measurement(1, seconds=1.0, violations=10),
+            _measurement(1, seconds=1.0, violations=20),
+            _measurement(10, seconds=2.0, violations=5),
+            _measurement(100, seconds=3.0, violations=5),
+            _measurement(1000, seconds=0.5, violations=30),
+            # other wall sizes are compared separately
+            _measurement(1, seconds=9.0, violations=99, width=20),
+        ]
+    )
+
+    by_attempts = {(s.width, s.max_attempts): s for s in summaries}
+    assert by_attempts[(10, 1)].walls == 2
+    assert by_attempts[(10, 1)].violations == 15
+    assert [s.pareto for s in summaries] == [True, True, False, True, True]
+
+
+def test_cli_writes_measurements(tmp_path):
+    output = tmp_path / "wild.csv"
+
+    result = CliRunner().invoke(
+        main,
+        [
+            "--sizes",
+            "12x6",
+            "--max-attempts",
+            "1,3",
+            "--probabilities",
+            "0.2",
+            "--seeds",
+            "2",
+            "--no-memory",
+            "-o",
+            str(output),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "| 12x6 | 3 | 0.2 | 2 |" in result.output
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [(row["max_attempts"], row["seed"]) for row in rows] == [
+        ("1", "0"),
+        ("1", "1"),
+        ("3", "0"),
+        ("3", "1"),
+    ]
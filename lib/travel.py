@@ -0,0 +1,329 @@
+import time
+from copy import deepcopy
+from dataclasses import dataclass, fields
+
+from .rows import LazyRows
+from .wall_state import Stride, WallState, build_with_strides, stride_score
+
+
+@dataclass(frozen=True)
+class BuildCostModel:
+    """Estimated build time of a stride plan in seconds.
+
+    The platform moves between consecutive stride origins, horizontally in wall units
+    (quarter bricks) and vertically in rows. It starts at the bottom left corner.
+    Each stride has a fixed setup time and each brick a fixed placement time.
+    """
+
+    move_seconds: float = 0.5
+    lift_seconds: float = 2.0
+    brick_seconds: float = 6.0
+    stride_seconds: float = 20.0
+
+    def __post_init__(self):
+        for field in fields(self):
+            if getattr(self, field.name) < 0:
+                raise ValueError(f"{field.name} must not be negative")
+
+    def travel_seconds(self, start: Stride | None, end: Stride) -> float:
+        """Time to move the platform between two stride origins."""
+        (x, y) = (start.origin_x, start.origin_y) if start else (0, 0)
+        return (
+            abs(end.origin_x - x) * self.move_seconds
+            + abs(end.origin_y - y) * self.lift_seconds
+        )
+
+    def stride_seconds_total(self, num_bricks: int) -> float:
+        """Time spent at a stride, without moving to it."""
+        return self.stride_seconds + num_bricks * self.brick_seconds
+
+    def estimate(self, strides: list[Stride], bricks_per_stride: list[int]) -> float:
+        """Estimate the build time of a plan."""
+        seconds = 0.0
+        previous = None
+        for stride, num_bricks in zip(strides, bricks_per_stride):
+            seconds += self.travel_seconds(previous, stride)
+            seconds += self.stride_seconds_total(num_bricks)
+            previous = stride
+        return seconds
+
+
+@dataclass
+class TravelPlan:
+    """Stride plan ordered to minimize the estimated build time."""
+
+    strides: list[Stride]
+    bricks_per_stride: list[int]
+    seconds: float
+    heuristic_seconds: float
+    moves: int
+    planning_seconds: float
+    greedy_seconds: float | None = None
+    greedy_strides: int | None = None
+
+
+def plan_heuristic(
+    wall: WallState,
+    stride_width: int,
+    stride_height: int,
+    cost_model: BuildCostModel,
+) -> list[Stride]:
+    """Build the wall with the stride that places the most bricks per second,
+    including the time to move there.
+
+    Candidates are the strides next to the previous one and the strides around the
+    nearest missing brick in the lowest incomplete row, so the platform can keep
+    building upwards and only returns to the lowest row when it pays off. Strides
+    further away are not scored, which keeps each step independent of the wall
+    width.
+    """
+    strides = []
+    previous = None
+    origin_y = 0
+    while not wall.is_complete:
+        # Placing bricks never makes a row incomplete again
+        origin_y = wall.first_incomplete_row(start=origin_y)
+        candidates = _candidates(wall, origin_y, previous, stride_width, stride_height)
+        best, best_score = None, (0.0, 0)
+        for stride in candidates:
+            num_bricks = stride_score(wall, stride)
+            if num_bricks == 0:
+                continue
+            seconds = cost_model.travel_seconds(
+                previous, stride
+            ) + cost_model.stride_seconds_total(num_bricks)
+            rate = num_bricks / seconds if seconds else float("inf")
+            if (rate, num_bricks) > best_score:
+                best, best_score = stride, (rate, num_bricks)
+        if best is None:
+            raise ValueError(f"No brick can be placed in row {candidates[0].origin_y}")
+        list(wall.place_bricks_for_stride(best))
+        strides.append(best)
+        previous = best
+    return strides
+
+
+def _candidates(
+    wall: WallState,
+    origin_y: int,
+    previous: Stride | None,
+    stride_width: int,
+    stride_height: int,
+) -> list[Stride]:
+    """Strides around the missing brick of the lowest incomplete row `origin_y`
+    nearest to the previous stride, and strides next to the previous one in the
+    lowest incomplete row and in the lowest row that is incomplete below it."""
+    origins = {
+        (x, origin_y) for x in _frontier_origins(wall, origin_y, previous, stride_width)
+    }
+    if previous is not None:
+        near = range(
+            max(previous.origin_x - stride_width, 0),
+            min(previous.origin_x + stride_width, wall.width - 1) + 1,
+        )
+        origins.update((x, origin_y) for x in near)
+        window = (previous.origin_x, previous.origin_x + stride_width)
+        local_y = wall.first_incomplete_row(window, start=origin_y)
+        if local_y is not None:
+            origins.update((x, local_y) for x in near)
+    return [
+        Stride(x, y, stride_width, stride_height)
+        for (x, y) in sorted(origins, key=lambda origin: (origin[1], origin[0]))
+    ]
+
+
+def _frontier_origins(
+    wall: WallState, row: int, previous: Stride | None, stride_width: int
+) -> range:
+    """Origins of the strides within a stride width of the missing brick in a row
+    nearest to the previous stride, the leftmost one without a previous stride."""
+    target = previous.origin_x if previous else 0
+    edges = wall.geometry.row_edges(row)
+    left_edge = min(
+        (
+            edges[col]
+            for col, brick in enumerate(wall.bricks[row])
+            if not brick.placed and not brick.opening
+        ),
+        key=lambda edge: abs(edge - target),
+    )
+    return range(
+        max(left_edge - stride_width, 0),
+        min(left_edge + stride_width, wall.width - 1) + 1,
+    )
+
+
+def stride_dependencies(wall: WallState, first_step: int) -> list[set[int]]:
+    """Get the strides each stride of a plan depends on.
+
+    The plan must have been placed on `wall`, starting at history step `first_step`.
+    A stride depends on an earlier stride if one of its bricks rests on a brick of
+    that stride and not on a brick of its own or one placed before the plan.
+    """
+    entries = wall.history.entries[first_step : wall.history.position]
+    if not entries:
+        return []
+    first_stride = entries[0].stride
+    owner = {(e.row, e.col): e.stride - first_stride for e in entries}
+    dependencies: list[set[int]] = [
+        set() for _ in range(entries[-1].stride - first_stride + 1)
+    ]
+
+    for (row, col), stride in owner.items():
+        if row == 0:
+            continue
+        for position in wall.geometry.brick_edges(row, col):
+            supports = [
+                owner.get((row - 1, below), -1)
+                for below in wall.geometry.bricks_at_position(row - 1, position)
+                if wall.bricks[row - 1][below].placed
+            ]
+            if not supports or -1 in supports or stride in supports:
+                continue  # lintel, placed before the plan or by the stride itself
+            dependencies[stride].update(s for s in supports if s < stride)
+    return dependencies
+
+
+def improve_order(
+    strides: list[Stride],
+    dependencies: list[set[int]],
+    cost_model: BuildCostModel,
+    neighbourhood: int = 50,
+    max_passes: int = 10,
+) -> tuple[list[Stride], int]:
+    """Reorder strides to reduce travel time with a local search.
+
+    Each stride is moved to the position within `neighbourhood` steps that saves the
+    most travel time, without passing any stride it depends on or that depends on
+    it. Passes repeat until nothing improves. Return the order and the number of
+    moves.
+    """
+    dependents: list[set[int]] = [set() for _ in strides]
+    for stride, required in enumerate(dependencies):
+        for other in required:
+            dependents[other].add(stride)
+
+    order = list(range(len(strides)))
+    travel = cost_model.travel_seconds
+
+    def at(position: int) -> Stride | None:
+        return strides[order[position]] if 0 <= position < len(order) else None
+
+    def between(start: Stride | None, end: Stride | None) -> float:
+        return 0.0 if end is None else travel(start, end)
+
+    moves = 0
+    for _ in range(max_passes):
+        improved = False
+        for position in range(len(order)):
+            index = order[position]
+            stride = strides[index]
+            before, after = at(position - 1), at(position + 1)
+            removal_gain = (
+                between(before, stride)
+                + between(stride, after)
+                - between(before, after)
+            )
+
+            best_gain, best_target = 1e-9, None
+            # Move left, stop at the first stride it depends on
+            for target in range(position - 1, max(position - neighbourhood, 0) - 1, -1):
+                if order[target] in dependencies[index]:
+                    break
+                left, right = at(target - 1), at(target)
+                gain = removal_gain - (
+                    between(left, stride)
+                    + between(stride, right)
+                    - between(left, right)
+                )
+                if gain > best_gain:
+                    best_gain, best_target = gain, target
+            # Move right, stop at the first stride that depends on it
+            for target in range(
+                position + 1, min(position + neighbourhood, len(order) - 1) + 1
+            ):
+                if order[target] in dependents[index]:
+                    break
+                left, right = at(target), at(target + 1)
+                gain = removal_gain - (
+                    between(left, stride)
+                    + between(stride, right)
+                    - between(left, right)
+                )
+                if gain > best_gain:
+                    best_gain, best_target = gain, target
+
+            if best_target is not None:
+                order.insert(best_target, order.pop(position))
+                moves += 1
+                improved = True
+        if not improved:
+            break
+
+    return ([strides[index] for index in order], moves)
+
+
+def plan_travel_aware(
+    wall: WallState,
+    stride_width: int,
+    stride_height: int,
+    cost_model: BuildCostModel | None = None,
+    neighbourhood: int = 50,
+    max_passes: int = 10,
+    compare: bool = False,
+) -> TravelPlan:
+    """Plan the strides for a wall to minimize the estimated build time.
+
+    The heuristic plan is improved by reordering strides with a local search. With
+    `compare` the greedy plan is built as well to report its estimated time. The
+    wall itself is not modified.
+    """
+    if isinstance(wall.bricks, LazyRows):
+        raise ValueError("Walls with lazy rows can not be planned for travel")
+    cost_model = cost_model or BuildCostModel()
+
+    start = time.perf_counter()
+    planned = deepcopy(wall)
+    first_step = planned.history.position
+    heuristic = plan_heuristic(planned, stride_width, stride_height, cost_model)
+    heuristic_bricks = _bricks_per_stride(planned, first_step)
+    dependencies = stride_dependencies(planned, first_step)
+    (strides, moves) = improve_order(
+        heuristic, dependencies, cost_model, neighbourhood, max_passes
+    )
+
+    # Replay the new order, a stride may now pick up bricks of a later one
+    replayed = deepcopy(wall)
+    kept, bricks_per_stride = [], []
+    for stride in strides:
+        num_bricks = len(list(replayed.place_bricks_for_stride(stride)))
+        if num_bricks:
+            kept.append(stride)
+            bricks_per_stride.append(num_bricks)
+    if not replayed.is_complete:
+        raise ValueError("Reordered plan does not complete the wall")
+    plan = TravelPlan(
+        strides=kept,
+        bricks_per_stride=bricks_per_stride,
+        seconds=cost_model.estimate(kept, bricks_per_stride),
+        heuristic_seconds=cost_model.estimate(heuristic, heuristic_bricks),
+        moves=moves,
+        planning_seconds=time.perf_counter() - start,
+    )
+    if compare:
+        greedy = deepcopy(wall)
+        first_step = greedy.history.position
+        greedy_strides = build_with_strides(greedy, stride_width, stride_height)
+        plan.greedy_seconds = cost_model.estimate(
+            greedy_strides, _bricks_per_stride(greedy, first_step)
+        )
+        plan.greedy_strides = len(greedy_strides)
+    return plan
+
+
+def _bricks_per_stride(wall: WallState, first_step: int) -> list[int]:
+    """Count the bricks per stride placed since a history step."""
+    counts: dict[int, int] = {}
+    for entry in wall.history.entries[first_step : wall.history.position]:
+        counts[entry.stride] = counts.get(entry.stride, 0) + 1
+    return list(counts.values())
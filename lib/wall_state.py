@@ -1,6 +1,5 @@
-from copy import deepcopy
 from dataclasses import dataclass, field
-from typing import Generator
+from typing import Generator, Sequence
 
 from .bonds import (
     Bond,
@@ -10,6 +9,11 @@ from .bonds import (
     initialize_stretcher_bond,
     initialize_wild_bond,
 )
+from .geometry import WallGeometry
+from .openings import Opening, OpeningIndex, cut_row
+from .placement_log import PlacementLog
+from .rows import BondRowProvider, LazyRows
+from .stride_cache import StrideScoreCache
 
 
 @dataclass
@@ -24,27 +28,34 @@ class Stride:
 class WallState:
     """Keeps track of the state of the wall and provides methods to manipulate it."""
 
-    bricks: list[list[Brick]] = field(default_factory=list)
+    bricks: list[list[Brick]] | LazyRows = field(default_factory=list)
     current_stride: int = 0
 
+    def __post_init__(self):
+        self._geometry: WallGeometry | None = None
+        self.history = PlacementLog()
+        self.stride_scores = StrideScoreCache()
+        self.openings = OpeningIndex()
+        # Rows still to come for progressively initialized walls
+        self.expected_height = 0
+
+    @property
+    def geometry(self) -> WallGeometry:
+        """Precomputed brick edges, built lazily for the current bricks."""
+        if self._geometry is None:
+            self._geometry = WallGeometry(self.bricks)
+        return self._geometry
+
     def to_dict(self) -> dict:
         return {
-            "bricks": [
-                [
-                    {
-                        "placed": brick.placed,
-                        "width": brick.width.value,
-                        "stride": brick.stride,
-                    }
-                    for brick in row
-                ]
-                for row in self.bricks
-            ],
+            "bricks": [[brick_to_dict(brick) for brick in row] for row in self.bricks],
             "is_complete": self.is_complete,
         }
 
     @property
     def width(self) -> int:
+        if isinstance(self.bricks, LazyRows):
+            return self.bricks.width
         return sum(brick.width for brick in self.bricks[0])
 
     @property
@@ -53,20 +64,86 @@ class WallState:
 
     @property
     def is_complete(self) -> bool:
-        return all(brick.placed for brick in self.bricks[-1])
+        if self.height < self.expected_height:
+            return False
+        return self._is_row_complete(self.height - 1)
+
+    def first_incomplete_row(
+        self, window: tuple[int, int] | None = None, start: int = 0
+    ) -> int | None:
+        """Get the lowest row with at least one brick not placed. With a (left,
+        right) window only bricks fully inside it are considered. Rows below `start`
+        are known to be complete and skipped."""
+        for row in range(start, self.height):
+            if window is None:
+                if not self._is_row_complete(row):
+                    return row
+                continue
+            (left, right) = window
+            bricks = self.bricks[row]
+            if any(
+                not bricks[col].placed and not bricks[col].opening
+                for col in self.geometry.columns_in_window(row, left, right - left)
+            ):
+                return row
+        return None
+
+    def _is_row_complete(self, row: int) -> bool:
+        if isinstance(self.bricks, LazyRows):
+            return self.bricks.is_row_complete(row)
+        return all(brick.placed or brick.opening for brick in self.bricks[row])
+
+    def _compact_rows_below(self, row: int) -> None:
+        """Drop fully placed rows below `row` to a compact summary in lazy mode,
+        together with their cached edges and stride scores."""
+        if not isinstance(self.bricks, LazyRows):
+            return
+        for compacted in self.bricks.compact_below(row):
+            self.geometry.forget(compacted)
+        self.stride_scores.forget_below(row)
 
     def initialize_wall(
-        self, width_in_half_bricks: int, height_in_rows: int, bond: Bond
+        self,
+        width_in_half_bricks: int,
+        height_in_rows: int,
+        bond: Bond,
+        lazy: bool = False,
+        openings: Sequence[Opening] = (),
+        progressive: bool = False,
     ) -> None:
-        """Common initialization for all bond patterns."""
+        """Common initialization for all bond patterns.
+
+        In lazy mode rows are only materialized when they are accessed, keeping
+        memory proportional to the rows being worked on instead of the wall height.
+        In progressive mode the wall starts without rows, generated rows are added
+        with `append_row`. Bricks are cut around `openings`.
+        """
         assert (
             width_in_half_bricks > 0 and height_in_rows > 0
         ), "Number of rows and columns must be positive"
 
+        opening_index = OpeningIndex(openings)
+        opening_index.validate(width_in_half_bricks, height_in_rows)
+
         self.bricks = []
         self.current_stride = 0
-
-        if bond == Bond.STRETCHER:
+        self._geometry = None
+        self.history.clear()
+        self.stride_scores.clear()
+        self.openings = opening_index
+        self.expected_height = 0
+
+        if progressive:
+            if lazy:
+                raise ValueError("Walls can not be both lazy and progressive")
+            self.expected_height = height_in_rows
+        elif lazy:
+            self.bricks = LazyRows(
+                BondRowProvider(
+                    width_in_half_bricks, height_in_rows, bond, opening_index
+                )
+            )
+        elif bond == Bond.STRETCHER:
             self.bricks = initialize_stretcher_bond(
                 width_in_half_bricks, height_in_rows
             )
@@ -77,60 +154,129 @@ class WallState:
         elif bond == Bond.WILD:
             self.bricks = initialize_wild_bond(width_in_half_bricks, height_in_rows)
 
+        if opening_index and not lazy:
+            self.bricks = [
+                cut_row(bricks, opening_index.spans(row))
+                for row, bricks in enumerate(self.bricks)
+            ]
+
+    def append_row(self, bricks: list[Brick]) -> None:
+        """Add the next generated row on top of a progressively initialized wall.
+
+        Bricks must already be cut around the openings.
+        """
+        if self.height >= self.expected_height:
+            raise ValueError("All rows of the wall have been added")
+        row = self.height
+        self.bricks.append(bricks)
+        # Strides reaching into the new row may place more bricks now
+        self.stride_scores.mark_dirty(row, 0, sum(brick.width for brick in bricks))
 
     def reset(self) -> None:
         """Reset the wall to its initial state."""
-        for row in self.bricks:
-            for brick in row:
-                brick.placed = False
-                brick.stride = None
+        if isinstance(self.bricks, LazyRows):
+            self.bricks.clear()
+        else:
+            for row in self.bricks:
+                for brick in row:
+                    brick.placed = False
+                    brick.stride = None
         self.current_stride = 1
+        self.history.clear()
+        self.stride_scores.clear()
+
+    def undo(self) -> bool:
+        """Revert the last placement. Return False if there is nothing to undo."""
+        placement = self.history.undo()
+        if placement is None:
+            return False
+        brick = self.bricks[placement.row][placement.col]
+        brick.placed = False
+        brick.stride = None
+        self._mark_dirty(placement.row, placement.col)
+        self._sync_current_stride()
+        return True
+
+    def redo(self) -> bool:
+        """Reapply the last undone placement. Return False if there is nothing to
+        redo."""
+        placement = self.history.redo()
+        if placement is None:
+            return False
+        brick = self.bricks[placement.row][placement.col]
+        brick.placed = True
+        brick.stride = placement.stride
+        self._mark_dirty(placement.row, placement.col)
+        self._sync_current_stride()
+        return True
+
+    def seek(self, step: int) -> None:
+        """Undo or redo placements until exactly `step` placements are applied."""
+        if not 0 <= step <= len(self.history.entries):
+            raise ValueError(f"Step out of bounds: {step}")
+        while self.history.position > step:
+            self.undo()
+        while self.history.position < step:
+            self.redo()
+
+    def _sync_current_stride(self) -> None:
+        """Continue stride numbering from the last applied placement."""
+        last = (
+            self.history.entries[self.history.position - 1]
+            if self.history.can_undo
+            else None
+        )
+        self.current_stride = (last.stride or 0) if last else 0
+
+    def _place_brick(self, row: int, col: int, stride: int | None = None) -> Brick:
+        """Place a brick and record it in the history."""
+        brick = self.bricks[row][col]
+        brick.placed = True
+        brick.stride = stride
+        self.history.record(row, col, stride)
+        self._mark_dirty(row, col)
+        return brick
+
+    def _mark_dirty(self, row: int, col: int) -> None:
+        """Invalidate cached stride scores that depend on a changed brick."""
+        self.stride_scores.mark_dirty(row, *self._get_brick_edges(row, col))
 
     def _get_brick_edges(self, row: int, col: int) -> tuple[int, int]:
         """Get distances to left and right edge of a brick in a row"""
-        try:
-            row_blocks = self.bricks[row]
-        except IndexError as e:
-            raise ValueError(f"Row out of bounds: {row}") from e
-
-        # Get left edge by summing widths of all bricks before this one
-        left_edge = sum(row_blocks[i].width for i in range(col))
-        right_edge = left_edge + row_blocks[col].width
+        return self.geometry.brick_edges(row, col)
 
-        return (left_edge, right_edge)
+    def _has_placed_brick_at_position(
+        self, row: int, position: int, pending: set[tuple[int, int]] | None = None
+    ) -> bool:
+        """Check if there is a placed brick at a given position in a row.
 
-    def _has_placed_brick_at_position(self, row: int, position: int) -> bool:
-        """Check if there is a placed brick at a given position in a row."""
+        Bricks in `pending` and positions on top of a lintel are treated as placed.
+        """
         try:
             row_blocks = self.bricks[row]
         except IndexError as e:
             raise ValueError(f"Row out of bounds: {row}") from e
 
-        # Find which brick contains this position by tracking cumulative width
-        current_edge = 0
-        for i, brick in enumerate(row_blocks):
-            next_edge = current_edge + brick.width
-
-            # Check if position is at this brick
-            if current_edge <= position <= next_edge:
-                # If exactly at right edge, check current and next brick
-                if position == next_edge and i + 1 < len(row_blocks):
-                    return brick.placed or row_blocks[i + 1].placed
-                # Otherwise just check current brick
-                return brick.placed
+        return any(
+            row_blocks[col].placed or (pending is not None and (row, col) in pending)
+            for col in self.geometry.bricks_at_position(row, position)
+        ) or self.openings.lintel_supports(row, position)
 
-            current_edge = next_edge
+    def _can_place_brick(
+        self, row: int, col: int, pending: set[tuple[int, int]] | None = None
+    ) -> bool:
+        """Check if a given brick is supported and can be placed.
 
-        return False  # Position is beyond row bounds
-
-    def _can_place_brick(self, row: int, col: int) -> bool:
-        """Check if a given brick is supported and can be placed."""
+        Bricks in `pending` are treated as placed.
+        """
         try:
             brick = self.bricks[row][col]
         except IndexError as e:
             raise ValueError(f" Brick out of bounds: row {row}, col {col}") from e
 
-        if brick.placed:
+        if brick.placed or brick.opening:
+            return False
+        if pending is not None and (row, col) in pending:
             return False
 
         if row == 0:
@@ -138,26 +284,34 @@ class WallState:
 
         (left_edge, right_edge) = self._get_brick_edges(row, col)
 
-        # Check if left middle and right are supported
-        left_supported = self._has_placed_brick_at_position(row - 1, left_edge)
-        right_supported = self._has_placed_brick_at_position(row - 1, right_edge)
-
-        return left_supported and right_supported
+        # Check if left and right are supported, the right only if the left is
+        return self._has_placed_brick_at_position(
+            row - 1, left_edge, pending
+        ) and self._has_placed_brick_at_position(row - 1, right_edge, pending)
 
-    def _is_brick_in_stride_window(self, row: int, col: int, stride: Stride) -> bool:
-        (left_edge, right_edge) = self._get_brick_edges(row, col)
-        return (
-            left_edge >= stride.origin_x
-            and right_edge <= stride.origin_x + stride.width
-        )
+    def _placeable_in_stride(
+        self, stride: Stride
+    ) -> Generator[tuple[int, int], None, None]:
+        """Yield (row, col) of all bricks a stride would place, without placing them."""
+        pending: set[tuple[int, int]] = set()
+        for row in range(stride.origin_y, stride.origin_y + stride.height):
+            if row >= self.height:
+                break
+            for col in self.geometry.columns_in_window(
+                row, stride.origin_x, stride.width
+            ):
+                if self._can_place_brick(row, col, pending):
+                    pending.add((row, col))
+                    yield (row, col)
 
     def place_bricks_left_to_right(self) -> Generator[Brick, None, None]:
         """Place bricks left to right, bottom to top."""
-        for row in self.bricks:
-            for brick in row:
-                if not brick.placed:
-                    brick.placed = True
-                    yield brick
+        for row in range(self.height):
+            self._compact_rows_below(row - 1)
+            for col in range(len(self.bricks[row])):
+                brick = self.bricks[row][col]
+                if not brick.placed and not brick.opening:
+                    yield self._place_brick(row, col)
 
     def place_bricks_for_stride(
         self,
@@ -165,46 +319,84 @@ class WallState:
     ) -> Generator[Brick, None, None]:
         """Place all placable bricks in a given stride and yield the bricks."""
         self.current_stride += 1
-        for row in range(stride.origin_y, stride.origin_y + stride.height):
-            if row >= self.height:
-                continue
-            for col, brick in enumerate(self.bricks[row]):
-                if not self._is_brick_in_stride_window(row, col, stride):
-                    continue  # brick is outside stride window
-                if self._can_place_brick(row, col):
-                    brick.placed = True
-                    brick.stride = self.current_stride
-                    yield brick
+        self._compact_rows_below(stride.origin_y - 1)
+        for row, col in self._placeable_in_stride(stride):
+            yield self._place_brick(row, col, self.current_stride)
+
+
+def brick_to_dict(brick: Brick) -> dict:
+    return {
+        "placed": brick.placed,
+        "width": brick.width.value,
+        "stride": brick.stride,
+        "opening": brick.opening,
+    }
 
 
 def find_best_stride(wall: WallState, stride_width: int, stride_height: int) -> Stride:
     """Find the next best stride for the wall."""
-    optimal_stride_origin_x = 0
     optimal_stride_origin_y = 0
 
     # find first row with at least one brick not placed
-    for y, row in enumerate(wall.bricks):
-        if any(not brick.placed for brick in row):
-            optimal_stride_origin_y = y
-            break
+    first_incomplete_row = wall.first_incomplete_row()
+    if first_incomplete_row is not None:
+        optimal_stride_origin_y = first_incomplete_row
 
     # for the given row, find the optimal starting x position to
     # maximize number of bricks placed
+    optimal_stride_origin_x, _ = best_stride_origin_x(
+        wall, optimal_stride_origin_y, stride_width, stride_height, range(wall.width)
+    )
+
+    return Stride(
+        optimal_stride_origin_x, optimal_stride_origin_y, stride_width, stride_height
+    )
+
+
+def best_stride_origin_x(
+    wall: WallState,
+    origin_y: int,
+    stride_width: int,
+    stride_height: int,
+    origins: range,
+) -> tuple[int, int]:
+    """Find the x origin in a row that places the most bricks. Return the origin
+    and the number of bricks, the first origin wins ties."""
+    optimal_stride_origin_x = origins.start
     max_num_placed_bricks = 0
-    for x in range(wall.width):
-        # copy wall to avoid modifying original
-        wall_temp = deepcopy(wall)
-        num_placed_bricks = len(
-            list(
-                wall_temp.place_bricks_for_stride(
-                    Stride(x, optimal_stride_origin_y, stride_width, stride_height)
-                )
-            )
+    for x in origins:
+        num_placed_bricks = stride_score(
+            wall, Stride(x, origin_y, stride_width, stride_height)
         )
         if num_placed_bricks > max_num_placed_bricks:
             max_num_placed_bricks = num_placed_bricks
             optimal_stride_origin_x = x
 
-    return Stride(
-        optimal_stride_origin_x, optimal_stride_origin_y, stride_width, stride_height
-    )
+    return (optimal_stride_origin_x, max_num_placed_bricks)
+
+
+def stride_score(wall: WallState, stride: Stride) -> int:
+    """Get the number of bricks a stride would place, cached per wall."""
+    key = (stride.origin_x, stride.origin_y, stride.width, stride.height)
+    num_placed_bricks = wall.stride_scores.get(*key)
+    if num_placed_bricks is None:
+        # count without placing to avoid modifying the original
+        num_placed_bricks = sum(1 for _ in wall._placeable_in_stride(stride))
+        wall.stride_scores.put(*key, num_placed_bricks)
+    return num_placed_bricks
+
+
+def build_with_strides(
+    wall: WallState, stride_width: int, stride_height: int
+) -> list[Stride]:
+    """Build the wall to completion, starting in the bottom left corner and
+    continuing with the best stride. Return the strides in order."""
+    strides = []
+    stride = Stride(0, 0, stride_width, stride_height)
+    while True:
+        if not list(wall.place_bricks_for_stride(stride)):
+            raise ValueError(f"No brick can be placed with stride {stride}")
+        strides.append(stride)
+        if wall.is_complete:
+            return strides
+        stride = find_best_stride(wall, stride_width, stride_height)
@@ -0,0 +1,248 @@
+"""Measure the quality and cost of Wildverband generation.
+
+    python -m lib.wild_benchmark --sizes 40x20,80x40 --max-attempts 10,100,1000 \\
+        --probabilities 0.1,0.2,0.3 --seeds 5 -o wild.csv
+
+Every combination of wall size, `max_attempts` and `half_brick_probability` is
+generated once per seed. Generation time, peak memory and the forbidden pattern
+positions left in the wall are recorded per wall and summarized in a Pareto table
+of time against violations per wall size.
+"""
+
+import csv
+import random
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from functools import partial
+from itertools import product
+from statistics import mean
+from typing import Callable
+
+import click
+
+from .bonds import Brick, BrickWidth, count_wildverband_violations, initialize_wild_bond
+
+WildBondGenerator = Callable[[int, int, int, float], list[list[Brick]]]
+
+
+@dataclass(frozen=True)
+class Config:
+    # Wall size in half bricks and rows, like /api/init
+    width: int
+    height: int
+    max_attempts: int
+    half_brick_probability: float
+
+
+@dataclass
+class Measurement:
+    width: int
+    height: int
+    max_attempts: int
+    half_brick_probability: float
+    seed: int
+    seconds: float
+    peak_bytes: int | None
+    violations: int
+
+
+@dataclass
+class Summary:
+    width: int
+    height: int
+    max_attempts: int
+    half_brick_probability: float
+    walls: int
+    seconds: float
+    peak_bytes: float | None
+    violations: float
+    pareto: bool = False
+
+
+def measure(
+    config: Config,
+    seed: int,
+    memory: bool = True,
+    generator: WildBondGenerator = initialize_wild_bond,
+) -> Measurement:
+    """Generate one wall and measure it.
+
+    Time is measured without tracing, peak memory in a second traced run with the
+    same seed. Violations are counted on the finished wall, independent of how the
+    generator checks its rows.
+    """
+    args = (
+        config.width * BrickWidth.HALF,
+        config.height,
+        config.max_attempts,
+        config.half_brick_probability,
+    )
+
+    random.seed(seed)
+    start = time.perf_counter()
+    rows = generator(*args)
+    seconds = time.perf_counter() - start
+
+    peak_bytes = None
+    if memory:
+        random.seed(seed)
+        tracemalloc.start()
+        try:
+            generator(*args)
+            (_, peak_bytes) = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return Measurement(
+        **asdict(config),
+        seed=seed,
+        seconds=seconds,
+        peak_bytes=peak_bytes,
+        violations=sum(count_wildverband_violations(rows)),
+    )
+
+
+def run_benchmark(
+    configs: list[Config],
+    seeds: range,
+    workers: int = 1,
+    memory: bool = True,
+    generator: WildBondGenerator = initialize_wild_bond,
+) -> list[Measurement]:
+    """Measure every config with every seed, in the order of the configs.
+
+    A different generator with the signature of `initialize_wild_bond` can be
+    passed to compare it, it must be picklable when running on several workers.
+    """
+    jobs = list(product(configs, seeds))
+    run = partial(_measure_job, memory=memory, generator=generator)
+    if workers == 1:
+        return [run(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, jobs))
+
+
+def summarize(measurements: list[Measurement]) -> list[Summary]:
+    """Average the measurements per config and mark the Pareto optimal configs.
+
+    A config is Pareto optimal if no other config of the same wall size is at least
+    as fast with at most as many violations and strictly better in one of them.
+    """
+    groups: dict[Config, list[Measurement]] = {}
+    for m in measurements:
+        config = Config(m.width, m.height, m.max_attempts, m.half_brick_probability)
+        groups.setdefault(config, []).append(m)
+
+    summaries = [
+        Summary(
+            **asdict(config),
+            walls=len(group),
+            seconds=mean(m.seconds for m in group),
+            peak_bytes=(
+                None
+                if any(m.peak_bytes is None for m in group)
+                else mean(m.peak_bytes for m in group)
+            ),
+            violations=mean(m.violations for m in group),
+        )
+        for config, group in groups.items()
+    ]
+    for summary in summaries:
+        summary.pareto = not any(
+            _dominates(other, summary)
+            for other in summaries
+            if (other.width, other.height) == (summary.width, summary.height)
+        )
+    return summaries
+
+
+def format_table(summaries: list[Summary]) -> str:
+    """Format summaries as a Markdown table, fastest first per wall size."""
+    lines = [
+        "| size | max_attempts | half_brick_probability | walls | seconds "
+        "| peak KiB | violations | pareto |",
+        "|---|---:|---:|---:|---:|---:|---:|:---:|",
+    ]
+    for s in sorted(summaries, key=lambda s: (s.width, s.height, s.seconds)):
+        peak = "-" if s.peak_bytes is None else f"{s.peak_bytes / 1024:.0f}"
+        lines.append(
+            f"| {s.width}x{s.height} | {s.max_attempts} | {s.half_brick_probability} "
+            f"| {s.walls} | {s.seconds:.4f} | {peak} | {s.violations:.2f} "
+            f"| {'*' if s.pareto else ''} |"
+        )
+    return "\n".join(lines)
+
+
+def write_measurements(measurements: list[Measurement], path: str) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=[f.name for f in fields(Measurement)])
+        writer.writeheader()
+        writer.writerows(asdict(m) for m in measurements)
+
+
+def _measure_job(
+    job: tuple[Config, int], memory: bool, generator: WildBondGenerator
+) -> Measurement:
+    (config, seed) = job
+    return measure(config, seed, memory, generator)
+
+
+def _dominates(a: Summary, b: Summary) -> bool:
+    return (
+        a.seconds <= b.seconds
+        and a.violations <= b.violations
+        and (a.seconds < b.seconds or a.violations < b.violations)
+    )
+
+
+def _parse_list(value: str, parse: Callable) -> list:
+    try:
+        return [parse(item) for item in value.split(",") if item.strip()]
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+def _parse_size(size: str) -> tuple[int, int]:
+    (width, height) = size.lower().split("x")
+    return (int(width), int(height))
+
+
+@click.command()
+@click.option(
+    "--sizes", default="20x10,40x20", help="Wall sizes as WIDTHxHEIGHT in half bricks."
+)
+@click.option("--max-attempts", default="10,100,1000", help="Candidate rows per row.")
+@click.option("--probabilities", default="0.1,0.2,0.3", help="Half brick probability.")
+@click.option("--seeds", type=int, default=5, help="Walls per configuration.")
+@click.option("-o", "--output", default=None, help="CSV file for all measurements.")
+@click.option("--workers", type=int, default=1, help="Worker processes.")
+@click.option("--no-memory", is_flag=True, help="Skip the traced memory run.")
+def main(sizes, max_attempts, probabilities, seeds, output, workers, no_memory):
+    """Sweep Wildverband generator parameters and print a Pareto table."""
+    configs = [
+        Config(width, height, attempts, probability)
+        for (width, height), attempts, probability in product(
+            _parse_list(sizes, _parse_size),
+            _parse_list(max_attempts, int),
+            _parse_list(probabilities, float),
+        )
+    ]
+    if any(
+        c.width <= 0 or c.height <= 0 or c.max_attempts <= 0 for c in configs
+    ) or any(not 0 <= c.half_brick_probability <= 1 for c in configs):
+        raise click.BadParameter(
+            "Sizes and attempts must be positive, probabilities in [0, 1]"
+        )
+
+    measurements = run_benchmark(
+        configs, range(seeds), workers=workers, memory=not no_memory
+    )
+    if output:
+        write_measurements(measurements, output)
+    click.echo(format_table(summarize(measurements)))
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter